@@ -1,8 +1,15 @@
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 from collections import deque
+from heapq import heappush, heappop
 from random import random
 from itertools import combinations
+from math import ceil, e, lgamma, log, log2, sqrt
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
 
 """
 Greedy Influence Maximization Algorithm
@@ -11,6 +18,9 @@ Input:
     - A networkX Graph object called G
     - A float activation probability between 0 and 1 that represents the chance a node has of activating each of its neighbors
     - An integer greater than or equal to 1 that represents the number of trials to perform to determine the average number of activated nodes per node
+    - An optional string method -- "bfs" (default), "vectorized" (see vectorized_influence_maximization) or "live_edge" (see live_edge_influence_maximization)
+    - An optional seed for the random number generator of the "vectorized" and "live_edge" methods, and of worker processes
+    - An optional integer workers -- if given, the vectorized engine is run across this many processes (see parallel_influence_maximization)
 
 Output:
     - A dict object keyed on node names of G with values representing the average influence of each node over trials trials
@@ -19,7 +29,13 @@ This function will perform a breadth-first search on the graph G trials times fo
 Each node has activation_probability chance of being activated by any activated adjacent node.
 The average number of visited nodes given a starting node is that starting node's calculated influence.
 """
-def greedy_influence_maximization(G, activation_probability=0.2, trials=1000):
+def greedy_influence_maximization(G, activation_probability=0.2, trials=1000, method="bfs", seed=None, workers=None):
+    if workers is not None:
+        return parallel_influence_maximization(G, activation_probability, trials, workers, seed=seed)
+    if method == "vectorized":
+        return vectorized_influence_maximization(G, activation_probability, trials, seed=seed)
+    if method == "live_edge":
+        return live_edge_influence_maximization(G, activation_probability, trials, seed=seed)
     nodes = G.nodes
     adj = G.adj
     influence_avg = {n: 0 for n in nodes}
@@ -28,16 +44,145 @@ def greedy_influence_maximization(G, activation_probability=0.2, trials=1000):
             q = deque()
             q.append(n)
             visited = set()
+            # Every node that has ever been queued, so membership is a set lookup rather than a scan of q
+            seen = {n}
             while q:
                 curr = q.popleft()
                 visited.add(curr)
                 for n1 in adj[curr]:
-                    if random() < activation_probability and n1 not in q and n1 not in visited:
+                    if random() < activation_probability and n1 not in seen:
+                        seen.add(n1)
                         q.append(n1)
             influence_avg[n] += len(visited)
         influence_avg[n] /= trials
     return influence_avg
 
+"""
+CSR Adjacency
+
+Input:
+    - A networkX Graph object called G
+    - An optional boolean argument reverse -- if G is directed, follow incoming edges instead of outgoing edges
+
+Output:
+    - A list of the nodes of G, in the order used to index the arrays below
+    - An integer array indptr of length |V| + 1
+    - An integer array indices -- the neighbors of the i-th node are indices[indptr[i]:indptr[i + 1]]
+
+This function flattens the adjacency of G into compressed sparse row (CSR) arrays so cascades can be simulated with NumPy.
+"""
+def csr_adjacency(G, reverse=False):
+    nodes = list(G.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    adj = G.pred if reverse and G.is_directed() else G.adj
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum([len(adj[n]) for n in nodes], out=indptr[1:])
+    indices = np.fromiter((index[n1] for n in nodes for n1 in adj[n]), dtype=np.int64, count=indptr[-1])
+    return nodes, indptr, indices
+
+"""
+Simple function to find the CSR positions of the neighbors of every node in frontier.
+Returns the position in frontier each neighbor came from, and the neighbor's position in the indices array.
+"""
+def neighbor_positions(indptr, frontier):
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    owner = np.repeat(np.arange(len(frontier)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, starts[owner] + offsets
+
+"""
+Batched Independent Cascade
+
+Input:
+    - The CSR arrays indptr and indices of a graph
+    - An integer array run_ids and an integer array seed_nodes -- seed_nodes[i] is initially active in cascade run_ids[i]
+    - An integer num_runs -- the number of cascades simulated at once
+    - A float activation probability between 0 and 1
+    - A numpy Generator called rng
+    - An optional boolean array active of length num_runs * |V| -- the activation bitmask of cascades to continue
+
+Output:
+    - An integer array of keys run * |V| + node, one for every node that was newly activated in every run
+
+Every run keeps a row of a (num_runs x |V|) activation bitmask, and all runs advance their frontiers together.
+Each step, every edge leaving a frontier node is tried once with a single vectorized coin flip, exactly as in the breadth-first search above.
+Passing the active bitmask of a finished batch continues those cascades from extra seeds without re-trying edges that were already tried.
+Callers that run many batches pass one zeroed buffer as active and reset only the returned keys afterwards (active[keys] = False),
+so a batch costs time proportional to the size of its cascades rather than to num_runs * |V|.
+"""
+def cascade_batch(indptr, indices, run_ids, seed_nodes, num_runs, activation_probability, rng, active=None):
+    n = len(indptr) - 1
+    if active is None:
+        active = np.zeros(num_runs * n, dtype=bool)
+    frontier = np.unique(np.asarray(run_ids, dtype=np.int64) * n + seed_nodes)
+    frontier = frontier[~active[frontier]]
+    active[frontier] = True
+    reached = [frontier]
+    while frontier.size:
+        runs, frontier_nodes = np.divmod(frontier, n)
+        owner, pos = neighbor_positions(indptr, frontier_nodes)
+        live = rng.random(pos.size) < activation_probability
+        candidates = runs[owner[live]] * n + indices[pos[live]]
+        frontier = np.unique(candidates[~active[candidates]])
+        active[frontier] = True
+        reached.append(frontier)
+    return np.concatenate(reached)
+
+"""
+Simulate Sources
+
+Input:
+    - The CSR arrays indptr and indices of a graph
+    - An integer array sources of node indices
+    - An integer trials -- the number of cascades to simulate from each source
+    - A float activation probability between 0 and 1
+    - A numpy Generator called rng
+    - An optional integer max_batch_cells -- the largest activation bitmask (runs x |V|) allocated at once
+
+Output:
+    - A float array with the sum of the cascade sizes of each source
+    - A float array with the sum of the squared cascade sizes of each source
+
+The len(sources) * trials cascades are split into batches that fit into max_batch_cells and simulated with cascade_batch.
+"""
+def simulate_sources(indptr, indices, sources, trials, activation_probability, rng, max_batch_cells=2**24):
+    n = len(indptr) - 1
+    sources = np.asarray(sources, dtype=np.int64)
+    total_runs = len(sources) * trials
+    runs_per_batch = max(1, max_batch_cells // max(n, 1))
+    size_sum = np.zeros(len(sources))
+    size_sq_sum = np.zeros(len(sources))
+    active = np.zeros(min(runs_per_batch, total_runs) * n, dtype=bool)
+    for first in range(0, total_runs, runs_per_batch):
+        run_source = np.arange(first, min(first + runs_per_batch, total_runs)) // trials
+        keys = cascade_batch(indptr, indices, np.arange(len(run_source)), sources[run_source], len(run_source), activation_probability, rng, active[:len(run_source) * n])
+        active[keys] = False
+        sizes = np.bincount(keys // n, minlength=len(run_source))
+        size_sum += np.bincount(run_source, weights=sizes, minlength=len(sources))
+        size_sq_sum += np.bincount(run_source, weights=sizes.astype(float) ** 2, minlength=len(sources))
+    return size_sum, size_sq_sum
+
+"""
+Vectorized Greedy Influence Maximization Algorithm
+
+Input:
+    - A networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - An integer greater than or equal to 1 that represents the number of trials to perform per node
+    - An optional seed for the numpy random number generator
+
+Output:
+    - A dict object keyed on node names of G with values representing the average influence of each node over trials trials
+
+This function computes the same quantity as greedy_influence_maximization, but converts G to CSR arrays once and simulates many cascades at a time with simulate_sources.
+"""
+def vectorized_influence_maximization(G, activation_probability=0.2, trials=1000, seed=None):
+    nodes, indptr, indices = csr_adjacency(G)
+    rng = np.random.default_rng(seed)
+    size_sum, _ = simulate_sources(indptr, indices, np.arange(len(nodes)), trials, activation_probability, rng)
+    return {n: size_sum[i] / trials for i, n in enumerate(nodes)}
+
 """
 High Degree Influence Maximization Algorithm
 
@@ -54,6 +199,490 @@ def high_degree_heuristic_influence_maximization(G):
     influence = {n: G.degree(n) for n in nodes}
     return influence
 
+"""
+Estimate Spread
+
+Input:
+    - The CSR arrays indptr and indices of a graph
+    - A list of node indices called seeds
+    - An integer trials -- the number of cascades to simulate
+    - A float activation probability between 0 and 1
+    - A numpy Generator called rng
+    - An optional node index extra
+    - An optional integer max_batch_cells -- the largest activation bitmask (runs x |V|) allocated at once
+
+Output:
+    - The average number of nodes activated by seeds
+    - The average number of nodes activated by seeds plus extra, or None if extra is not given
+
+The second estimate continues each cascade of the first from extra, so both come from the same simulations.
+"""
+def estimate_spread(indptr, indices, seeds, trials, activation_probability, rng, extra=None, max_batch_cells=2**24):
+    n = len(indptr) - 1
+    seeds = np.asarray(seeds, dtype=np.int64)
+    runs_per_batch = max(1, max_batch_cells // max(n, 1))
+    total, total_extra = 0, 0
+    buffer = np.zeros(min(runs_per_batch, trials) * n, dtype=bool)
+    for first in range(0, trials, runs_per_batch):
+        runs = min(runs_per_batch, trials - first)
+        active = buffer[:runs * n]
+        keys = cascade_batch(indptr, indices, np.repeat(np.arange(runs), len(seeds)), np.tile(seeds, runs), runs, activation_probability, rng, active)
+        total += len(keys)
+        if extra is not None:
+            extra_keys = cascade_batch(indptr, indices, np.arange(runs), np.full(runs, extra), runs, activation_probability, rng, active)
+            total_extra += len(extra_keys)
+            active[extra_keys] = False
+        active[keys] = False
+    if extra is None:
+        return total / trials, None
+    return total / trials, (total + total_extra) / trials
+
+# Adjacency arrays of the graph being simulated, set once in each worker process by init_worker
+worker_graph = None
+
+def init_worker(indptr, indices):
+    global worker_graph
+    worker_graph = (indptr, indices)
+
+"""
+Simple function to run one chunk of sources in a worker, with a random number generator seeded only by the chunk's own seed sequence.
+"""
+def simulate_task(task):
+    sources, trials, activation_probability, seed_sequence = task
+    indptr, indices = worker_graph
+    return simulate_sources(indptr, indices, sources, trials, activation_probability, np.random.default_rng(seed_sequence))
+
+"""
+Parallel Greedy Influence Maximization Algorithm
+
+Input:
+    - A networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - An integer greater than or equal to 1 that represents the number of trials to perform per node
+    - An optional integer workers -- the number of processes to use, or None to run in this process
+    - An optional seed -- runs with the same seed give identical results
+    - An optional integer chunk_size -- the number of nodes simulated by one task
+
+Output:
+    - A dict object keyed on node names of G with values representing the average influence of each node over trials trials
+
+The nodes are split into fixed chunks of chunk_size, and each chunk is simulated with simulate_sources in a process pool.
+Workers receive only the CSR arrays of G once, when the pool starts, instead of a pickled networkX graph.
+Every chunk gets its own random stream, spawned from one SeedSequence by chunk index, so the result for a given seed
+does not depend on the number of workers or on the order the chunks finish in.
+"""
+def parallel_influence_maximization(G, activation_probability=0.2, trials=1000, workers=None, seed=None, chunk_size=64):
+    nodes, indptr, indices = csr_adjacency(G)
+    chunks = [np.arange(first, min(first + chunk_size, len(nodes))) for first in range(0, len(nodes), chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [(chunk, trials, activation_probability, seed_sequence) for chunk, seed_sequence in zip(chunks, seed_sequences)]
+    if workers is None or workers <= 1:
+        init_worker(indptr, indices)
+        results = list(map(simulate_task, tasks))
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(indptr, indices)) as pool:
+            results = list(pool.map(simulate_task, tasks))
+    influence_avg = {}
+    for chunk, (size_sum, _) in zip(chunks, results):
+        for i, total in zip(chunk, size_sum):
+            influence_avg[nodes[i]] = total / trials
+    return influence_avg
+
+"""
+Select Seeds -- Greedy seed-set selection with lazy (CELF / CELF++) evaluation
+
+Input:
+    - A networkX Graph object called G
+    - An integer k -- the number of seeds to select
+    - A float activation probability between 0 and 1
+    - An integer number of trials used for every spread estimate
+    - An optional string method -- "celf++" (default), "celf", or "greedy"
+    - An optional seed for the numpy random number generator
+
+Output:
+    - A list of k node names, in the order they were selected
+    - A dict object of statistics:
+        - "spread" -- the estimated number of nodes activated by the seed set
+        - "evaluations" -- the number of marginal gain estimates that were made
+        - "simulations" -- the number of cascades simulated for those estimates, counting the second cascade CELF++ runs per trial for the best candidate
+        - "greedy_simulations" -- the number of cascades plain greedy selection would simulate
+
+Plain greedy selection re-estimates the marginal gain of every remaining node each time a seed is added.
+Marginal gains can only shrink as the seed set grows (submodularity), so CELF keeps nodes in a priority queue keyed on their last known gain,
+and only re-estimates the node at the top of the queue; if its gain is still the largest once it is up to date, it is selected.
+CELF++ also estimates each node's gain with respect to the current best candidate by continuing each of the same trials from it (one more cascade per trial),
+so if that candidate is the next seed chosen, the node's new gain is already known.
+"""
+def select_seeds(G, k, activation_probability=0.2, trials=1000, method="celf++", seed=None):
+    nodes, indptr, indices = csr_adjacency(G)
+    n = len(nodes)
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+    evaluations, simulations = 0, 0
+    greedy_evaluations = sum(n - i for i in range(k))
+    S, spread = [], 0
+
+    if method == "greedy":
+        for _ in range(k):
+            best, best_spread = None, -1
+            for u in range(n):
+                if u not in S:
+                    u_spread, _ = estimate_spread(indptr, indices, S + [u], trials, activation_probability, rng)
+                    evaluations += 1
+                    simulations += trials
+                    if u_spread > best_spread:
+                        best, best_spread = u, u_spread
+            S.append(best)
+            spread = best_spread
+        return [nodes[u] for u in S], {"spread": spread, "evaluations": evaluations, "simulations": simulations, "greedy_simulations": greedy_evaluations * trials}
+
+    # For each node: [marginal gain, size of S it is up to date with, prev_best, gain given S + prev_best]
+    state = {}
+    heap = []
+    cur_best = None
+    last_seed = None
+    for u in range(n):
+        extra = cur_best if method == "celf++" else None
+        u_spread, pair_spread = estimate_spread(indptr, indices, [u], trials, activation_probability, rng, extra)
+        evaluations += 1
+        simulations += trials if extra is None else 2 * trials
+        mg2 = None if extra is None else pair_spread - state[cur_best][0]
+        state[u] = [u_spread, 0, extra, mg2]
+        heappush(heap, (-u_spread, u))
+        if cur_best is None or u_spread > state[cur_best][0]:
+            cur_best = u
+
+    while len(S) < k:
+        _, u = heappop(heap)
+        mg1, flag, prev_best, mg2 = state[u]
+        if flag == len(S):
+            S.append(u)
+            spread += mg1
+            last_seed = u
+            cur_best = None
+            continue
+        if method == "celf++" and flag == len(S) - 1 and prev_best == last_seed and mg2 is not None:
+            mg1 = mg2
+            prev_best, mg2 = None, None
+        else:
+            extra = cur_best if method == "celf++" else None
+            u_spread, pair_spread = estimate_spread(indptr, indices, S + [u], trials, activation_probability, rng, extra)
+            evaluations += 1
+            simulations += trials if extra is None else 2 * trials
+            mg1 = u_spread - spread
+            prev_best = extra
+            mg2 = None if extra is None else pair_spread - (spread + state[cur_best][0])
+        state[u] = [mg1, len(S), prev_best, mg2]
+        heappush(heap, (-mg1, u))
+        if cur_best is None or mg1 > state[cur_best][0]:
+            cur_best = u
+
+    return [nodes[u] for u in S], {"spread": spread, "evaluations": evaluations, "simulations": simulations, "greedy_simulations": greedy_evaluations * trials}
+
+"""
+Reverse Influence Sampler -- Reverse-reachable set (RIS / IMM) influence estimation
+
+Input:
+    - A networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - An optional seed for the numpy random number generator
+    - An optional integer max_memory -- the largest number of bytes the stored RR sets may use
+
+A reverse-reachable (RR) set is generated by picking a random root node and running a cascade backwards from it, following incoming edges.
+A node v lands in an RR set with probability influence(v) / |V|, so |V| times the fraction of RR sets containing v is an unbiased estimate of the influence of v,
+and |V| times the fraction of RR sets hit by a seed set S estimates the influence of S.
+All RR sets are stored back to back in one flat int32 array rr_nodes, with the i-th set at rr_nodes[rr_offsets[i]:rr_offsets[i + 1]].
+Once max_memory is reached no further sets are kept, and the "memory_capped" attribute is set.
+
+Methods:
+    - sample(count) -- generate RR sets until count are stored
+    - influence(epsilon, delta) -- per-node influence estimates, as a dict
+    - top_k(k) -- the k seeds covering the most stored RR sets
+    - imm(k, epsilon, delta) -- IMM seed selection with its sample size bound
+"""
+class ReverseInfluenceSampler:
+    def __init__(self, G, activation_probability=0.2, seed=None, max_memory=2**28, max_batch_cells=2**24):
+        self.nodes, self.indptr, self.indices = csr_adjacency(G, reverse=True)
+        self.n = len(self.nodes)
+        self.activation_probability = activation_probability
+        self.rng = np.random.default_rng(seed)
+        self.max_memory = max_memory
+        self.max_batch_cells = max_batch_cells
+        self.clear()
+
+    def clear(self):
+        self.rr_nodes = np.zeros(0, dtype=np.int32)
+        self.rr_offsets = np.zeros(1, dtype=np.int64)
+        self.memory_capped = False
+
+    def __len__(self):
+        return len(self.rr_offsets) - 1
+
+    def memory(self):
+        return self.rr_nodes.nbytes + self.rr_offsets.nbytes
+
+    def sample(self, count):
+        n = self.n
+        runs_per_batch = max(1, self.max_batch_cells // max(n, 1))
+        node_chunks, size_chunks = [self.rr_nodes], []
+        stored, used = len(self), self.memory()
+        active = np.zeros(min(runs_per_batch, max(count - stored, 0)) * n, dtype=bool)
+        while stored < count and not self.memory_capped:
+            runs = min(runs_per_batch, count - stored)
+            roots = self.rng.integers(n, size=runs)
+            keys = np.sort(cascade_batch(self.indptr, self.indices, np.arange(runs), roots, runs, self.activation_probability, self.rng, active[:runs * n]))
+            active[keys] = False
+            sizes = np.bincount(keys // n, minlength=runs)
+            # Keep whole sets only, while they fit in the memory cap
+            fits = np.searchsorted(used + np.cumsum(4 * sizes + 8), self.max_memory, side="right")
+            if fits < runs:
+                self.memory_capped = True
+                sizes = sizes[:fits]
+                keys = keys[:sizes.sum()]
+            node_chunks.append((keys % n).astype(np.int32))
+            size_chunks.append(sizes)
+            stored += len(sizes)
+            used += 4 * sizes.sum() + 8 * len(sizes)
+        if size_chunks:
+            self.rr_nodes = np.concatenate(node_chunks)
+            self.rr_offsets = np.concatenate([self.rr_offsets, self.rr_offsets[-1] + np.cumsum(np.concatenate(size_chunks))])
+
+    """
+    Per-node influence estimates. If epsilon and delta are given, enough RR sets are sampled first that, with probability at least 1 - delta,
+    every estimate is within epsilon * |V| of the true influence (a Hoeffding bound over all nodes at once).
+    Returns the dict of estimates and the error bound that holds with probability 1 - delta for the sets actually stored.
+    """
+    def influence(self, epsilon=None, delta=0.01):
+        if epsilon is not None:
+            self.sample(ceil(log(2 * self.n / delta) / (2 * epsilon ** 2)))
+        theta = len(self)
+        if theta == 0:
+            raise ValueError("No RR sets are stored: call sample() first, pass epsilon, or raise max_memory")
+        counts = np.bincount(self.rr_nodes, minlength=self.n)
+        error_bound = self.n * sqrt(log(2 * self.n / delta) / (2 * theta))
+        return {v: self.n * counts[i] / theta for i, v in enumerate(self.nodes)}, error_bound
+
+    """
+    Greedy maximum coverage over the stored RR sets. Returns the k seed indices and the fraction of RR sets they cover.
+    """
+    def node_selection(self, k):
+        n, theta = self.n, len(self)
+        set_of_entry = np.repeat(np.arange(theta), np.diff(self.rr_offsets))
+        order = np.argsort(self.rr_nodes, kind="stable")
+        sets_by_node = set_of_entry[order]
+        coverage = np.bincount(self.rr_nodes, minlength=n)
+        node_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(coverage, out=node_ptr[1:])
+        covered = np.zeros(theta, dtype=bool)
+        seeds = []
+        for _ in range(min(k, n)):
+            v = int(np.argmax(coverage))
+            seeds.append(v)
+            # Once every RR set is covered all counts are 0, so chosen nodes are marked below that to keep the seeds distinct
+            coverage[v] = -1
+            newly = sets_by_node[node_ptr[v]:node_ptr[v + 1]]
+            newly = newly[~covered[newly]]
+            covered[newly] = True
+            _, entries = neighbor_positions(self.rr_offsets, newly)
+            coverage -= np.bincount(self.rr_nodes[entries], minlength=n)
+        return seeds, covered.sum() / max(theta, 1)
+
+    def top_k(self, k):
+        seeds, fraction = self.node_selection(k)
+        return [self.nodes[v] for v in seeds], float(self.n * fraction)
+
+    """
+    IMM seed selection (Tang, Shi and Xiao, 2015). A lower bound on the optimal influence is found by sampling with geometrically
+    growing sample sizes, which fixes how many RR sets are needed for the returned seeds to reach (1 - 1/e - epsilon) of the optimum
+    with probability at least 1 - delta. The final seeds are chosen from freshly generated RR sets, independent of those used for the bound.
+    Returns the seeds, their estimated influence, and a dict of statistics.
+    """
+    def imm(self, k, epsilon=0.1, delta=None):
+        n = self.n
+        k = min(k, n)
+        if n < 4:
+            self.clear()
+            self.sample(ceil(log(2 * max(n, 2) / (delta or 0.01)) / (2 * epsilon ** 2)))
+            seeds, spread = self.top_k(k)
+            return seeds, spread, {"rr_sets": len(self), "memory": self.memory(), "memory_capped": self.memory_capped}
+        if delta is None:
+            delta = 1 / n
+        l = log(1 / delta) / log(n)
+        l = l * (1 + log(2) / log(n))
+        log_binom = lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+        epsilon_prime = sqrt(2) * epsilon
+        lambda_prime = (2 + 2 / 3 * epsilon_prime) * (log_binom + l * log(n) + log(log2(n))) * n / epsilon_prime ** 2
+        lower_bound = 1
+        self.clear()
+        for i in range(1, int(log2(n))):
+            x = n / 2 ** i
+            self.sample(ceil(lambda_prime / x))
+            _, fraction = self.node_selection(k)
+            if n * fraction >= (1 + epsilon_prime) * x:
+                lower_bound = float(n * fraction / (1 + epsilon_prime))
+                break
+        alpha = sqrt(l * log(n) + log(2))
+        beta = sqrt((1 - 1 / e) * (log_binom + l * log(n) + log(2)))
+        lambda_star = 2 * n * ((1 - 1 / e) * alpha + beta) ** 2 / epsilon ** 2
+        theta = ceil(lambda_star / lower_bound)
+        self.clear()
+        self.sample(theta)
+        seeds, spread = self.top_k(k)
+        return seeds, spread, {"rr_sets": len(self), "required_rr_sets": theta, "lower_bound": lower_bound, "memory": self.memory(), "memory_capped": self.memory_capped}
+
+"""
+Adaptive Greedy Influence Maximization Algorithm
+
+Input:
+    - A networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - An optional float ci_width -- a node stops once the width of its confidence interval is at most this fraction of its mean influence
+      (0.2 by default, so an influence of 20 nodes is known to within about +-2 nodes)
+    - An optional float confidence -- the confidence level of the intervals
+    - An optional integer top_k -- if given, a node also stops once it is certainly in, or certainly out of, the k most influential nodes
+    - Integers min_trials and max_trials -- the fewest and most trials any node runs (at most 1000 by default, the trials of the fixed estimators)
+    - An optional seed for the numpy random number generator
+
+Output:
+    - A dict object keyed on node names of G with values representing the average influence of each node
+    - A dict object keyed on node names of G with (low, high) confidence intervals for each node's influence
+    - A dict object keyed on node names of G with the number of trials each node used
+
+Instead of a fixed number of trials, nodes are simulated in rounds that double the trials of every node still running,
+and the running mean and variance of each node's cascade sizes decide when it can stop.
+Isolated and leaf nodes have little or no variance, so they stop after min_trials, while the budget goes to the nodes whose influence is uncertain.
+Because the width is relative to the mean and the trials are capped at the fixed estimators' 1000, no node runs more trials than it would there.
+"""
+def adaptive_influence_maximization(G, activation_probability=0.2, ci_width=0.2, confidence=0.95, top_k=None, min_trials=32, max_trials=1000, seed=None):
+    nodes, indptr, indices = csr_adjacency(G)
+    n = len(nodes)
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    size_sum = np.zeros(n)
+    size_sq_sum = np.zeros(n)
+    trials = np.zeros(n, dtype=np.int64)
+    half_width = np.full(n, np.inf)
+    running = np.ones(n, dtype=bool)
+    while running.any():
+        sources = np.flatnonzero(running)
+        done = trials[sources[0]]
+        batch = min(max(done, min_trials), max_trials - done)
+        batch_sum, batch_sq_sum = simulate_sources(indptr, indices, sources, batch, activation_probability, rng)
+        size_sum[sources] += batch_sum
+        size_sq_sum[sources] += batch_sq_sum
+        trials[sources] += batch
+
+        mean = size_sum[sources] / trials[sources]
+        variance = np.maximum(size_sq_sum[sources] - trials[sources] * mean ** 2, 0) / np.maximum(trials[sources] - 1, 1)
+        half_width[sources] = z * np.sqrt(variance / trials[sources])
+        stop = (2 * half_width[sources] <= ci_width * mean) | (trials[sources] >= max_trials)
+        if top_k is not None and top_k < n:
+            means = size_sum / np.maximum(trials, 1)
+            lows, highs = means - half_width, means + half_width
+            kth_low = np.partition(lows, n - top_k)[n - top_k]
+            next_high = np.partition(highs, n - top_k - 1)[n - top_k - 1]
+            stop |= (highs[sources] < kth_low) | (lows[sources] > next_high)
+        running[sources[stop]] = False
+
+    mean = size_sum / trials
+    influence_avg = {v: mean[i] for i, v in enumerate(nodes)}
+    intervals = {v: (mean[i] - half_width[i], mean[i] + half_width[i]) for i, v in enumerate(nodes)}
+    trials_used = {v: int(trials[i]) for i, v in enumerate(nodes)}
+    return influence_avg, intervals, trials_used
+
+"""
+Live-Edge Influence Maximization Algorithm
+
+Input:
+    - An undirected networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - An integer greater than or equal to 1 that represents the number of live-edge snapshots to sample
+    - An optional seed for the numpy random number generator
+    - An optional integer max_batch_cells -- the largest number of (snapshot, node) pairs labelled at once
+
+Output:
+    - A dict object keyed on node names of G with values representing the average influence of each node over trials snapshots
+
+On an undirected graph an independent cascade is equivalent to keeping each edge "live" with probability activation_probability,
+after which the nodes activated from a start node are exactly its connected component in the live subgraph.
+So one snapshot credits every node with the size of its component, at a cost of O(|V| + |E|) rather than one search per node.
+Several snapshots are laid out side by side as one block-diagonal graph so their components are labelled in a single call.
+"""
+@nx.utils.not_implemented_for("directed")
+def live_edge_influence_maximization(G, activation_probability=0.2, trials=1000, seed=None, max_batch_cells=2**24):
+    nodes, indptr, indices = csr_adjacency(G)
+    n = len(nodes)
+    rng = np.random.default_rng(seed)
+    # Each undirected edge once, as (u, v) with u < v
+    heads = np.repeat(np.arange(n), np.diff(indptr))
+    once = heads < indices
+    u, v = heads[once], indices[once]
+    snapshots_per_batch = max(1, max_batch_cells // max(n + len(u), 1))
+    influence_sum = np.zeros(n)
+    for first in range(0, trials, snapshots_per_batch):
+        snapshots = min(snapshots_per_batch, trials - first)
+        live = rng.random((snapshots, len(u))) < activation_probability
+        snapshot, edge = np.nonzero(live)
+        live_graph = csr_matrix((np.ones(len(edge), dtype=np.int8), (snapshot * n + u[edge], snapshot * n + v[edge])), shape=(snapshots * n, snapshots * n))
+        _, labels = connected_components(live_graph, directed=False)
+        component_sizes = np.bincount(labels)
+        influence_sum += component_sizes[labels].reshape(snapshots, n).sum(axis=0)
+    return {node: influence_sum[i] / trials for i, node in enumerate(nodes)}
+
+"""
+Test Vectorized -- A correctness check of vectorized_influence_maximization against greedy_influence_maximization
+
+Input:
+    - A networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - An integer number of trials per node
+    - An optional float z_bound -- the number of standard errors two estimates of the same node may differ by
+
+Output:
+    - A boolean value -- true if every node's two estimates agree within z_bound standard errors
+
+Both implementations estimate the same expected cascade size, so their averages should only differ by sampling noise.
+The standard error of each node is taken from the per-trial variance measured by the vectorized engine.
+"""
+def test_vectorized(G, activation_probability=0.2, trials=1000, z_bound=4):
+    reference = greedy_influence_maximization(G, activation_probability, trials)
+    nodes, indptr, indices = csr_adjacency(G)
+    size_sum, size_sq_sum = simulate_sources(indptr, indices, np.arange(len(nodes)), trials, activation_probability, np.random.default_rng())
+    mean = size_sum / trials
+    variance = np.maximum(size_sq_sum / trials - mean ** 2, 0)
+    # Both estimates carry the same variance; a floor keeps zero-variance nodes (isolated nodes) comparable
+    std_error = np.sqrt(np.maximum(2 * variance / trials, 1e-12))
+    differences = np.array([reference[n] for n in nodes]) - mean
+    passed = int(np.sum(np.abs(differences) <= z_bound * std_error))
+    print(f"{passed} / {len(nodes)} nodes agree within {z_bound} standard errors (largest difference {np.abs(differences).max():.3f}).")
+    return passed == len(nodes)
+
+"""
+Test RIS -- A check of ReverseInfluenceSampler's per-node estimates against the existing Monte Carlo estimator
+
+Input:
+    - A networkX Graph object called G
+    - A float activation probability between 0 and 1
+    - Floats epsilon and delta -- the RIS estimates should be within epsilon * |V| of the true influence with probability 1 - delta
+    - An integer number of Monte Carlo trials per node
+
+Output:
+    - A boolean value -- true if every node's RIS estimate is within the stated bound of its Monte Carlo estimate
+
+The Monte Carlo estimate carries its own sampling noise, so four of its standard errors are added to the RIS bound.
+"""
+def test_ris(G, activation_probability=0.2, epsilon=0.02, delta=0.01, trials=1000):
+    sampler = ReverseInfluenceSampler(G, activation_probability)
+    estimates, error_bound = sampler.influence(epsilon, delta)
+    nodes, indptr, indices = csr_adjacency(G)
+    size_sum, size_sq_sum = simulate_sources(indptr, indices, np.arange(len(nodes)), trials, activation_probability, np.random.default_rng())
+    mean = size_sum / trials
+    std_error = np.sqrt(np.maximum(size_sq_sum / trials - mean ** 2, 0) / trials)
+    differences = np.abs(np.array([estimates[n] for n in nodes]) - mean)
+    passed = int(np.sum(differences <= error_bound + 4 * std_error))
+    print(f"{passed} / {len(nodes)} nodes within the ({epsilon}, {delta}) bound of {error_bound:.2f} using {len(sampler)} RR sets (largest difference {differences.max():.3f}).")
+    return passed == len(nodes)
+
 """
 Test -- A testing function for the previously defined influence maximization algorithms
 
@@ -131,4 +760,21 @@ G1 = nx.connected_watts_strogatz_graph(100, 5, 0.2)
 # G1 = nx.Graph([*combinations(range(1,6), 2)] + [*combinations(range(6,11), 2)] + [*combinations(range(11,16), 2)])
 
 # Runs the test case
-test(G1)
+if __name__ == "__main__":
+    test(G1)
+
+    # Compares the vectorized cascade engine against the breadth-first search implementation
+    # test_vectorized(G1)
+
+    # Selects a set of 5 seeds with CELF++ and reports how many simulations lazy evaluation saved
+    # print(select_seeds(G1, 5))
+
+    # Compares reverse influence sampling estimates against Monte Carlo, then selects 5 seeds with IMM
+    # test_ris(G1)
+    # print(ReverseInfluenceSampler(G1).imm(5))
+
+    # Estimates influence with adaptive trial counts, stopping each node once its 95% confidence interval is narrower than 20% of its mean
+    # print(adaptive_influence_maximization(G1))
+
+    # Runs the vectorized engine across 4 processes; the result only depends on the seed
+    # print(greedy_influence_maximization(G1, workers=4, seed=0))
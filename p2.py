@@ -1,7 +1,12 @@
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 from collections import deque
 from random import randrange
+from math import ceil, log
+from time import perf_counter
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
 
 """
 Simple function to sort edges to be consistently ordered
@@ -88,17 +93,266 @@ def calculate_edge_weights(g, dist_dict, sp_dict):
                 edge_weights[sort_edge((n, pred))] = (1 + sum_incoming) * (sp_dict[pred] / sp_dict[n])
     return edge_weights
 
+"""
+Edge-Indexed CSR Graph
+
+Input:
+    - A networkX graph object called G
+
+Output:
+    - A list of the nodes of G, in the order used to index the arrays below
+    - A list of the edges of G, in the order used for edge ids
+    - An integer array indptr of length |V| + 1
+    - An integer array indices -- the neighbors of the i-th node are indices[indptr[i]:indptr[i + 1]]
+    - An integer array edge_ids -- edge_ids[j] is the id of the edge leading to indices[j]
+
+Every undirected edge appears twice in the adjacency, once from each end, with the same edge id.
+"""
+def edge_csr(g):
+    nodes = list(g.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    edges = list(g.edges())
+    m = len(edges)
+    ends = np.array([(index[a], index[b]) for a, b in edges], dtype=np.int64).reshape(m, 2)
+    heads = np.concatenate([ends[:, 0], ends[:, 1]])
+    tails = np.concatenate([ends[:, 1], ends[:, 0]])
+    ids = np.concatenate([np.arange(m), np.arange(m)])
+    order = np.argsort(heads, kind="stable")
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(heads, minlength=len(nodes)), out=indptr[1:])
+    return nodes, edges, indptr, tails[order], ids[order]
+
+"""
+Simple function to find the CSR positions of the neighbors of every node in frontier.
+Returns the position in frontier each neighbor came from, and the neighbor's position in the indices array.
+"""
+def neighbor_positions(indptr, frontier):
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    owner = np.repeat(np.arange(len(frontier)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, starts[owner] + offsets
+
+"""
+Accumulate Edge Dependencies (Brandes' algorithm for a single source)
+
+Input:
+    - The CSR arrays indptr, indices and edge_ids of a graph
+    - A source node index, source
+    - Preallocated buffers dist (filled with -1), sigma and delta (filled with 0), each of length |V|
+    - An edge-indexed float array edge_score that the dependencies of source are added to
+    - An optional edge-indexed boolean array alive -- edges marked False are treated as removed
+    - An optional float scale that the dependencies are multiplied by before being added (-1 subtracts them)
+
+Output:
+    - A list of (pred, succ, edge id, dependency) arrays, one per BFS level -- the shortest-path DAG of source and the dependency of source on each of its edges
+
+The breadth-first search runs one level at a time: the edges from level d to level d + 1 form the predecessor lists of the DAG,
+and the number of shortest paths sigma of each node at level d + 1 is the sum of sigma over its predecessors.
+Walking the levels back from the farthest, each DAG edge (u, v) receives sigma[u] / sigma[v] * (1 + delta[v]), which is also added to delta[u].
+The buffers are reset before returning, so they can be reused for the next source.
+"""
+def accumulate_edge_dependencies(indptr, indices, edge_ids, source, dist, sigma, delta, edge_score, alive=None, scale=1):
+    dist[source] = 0
+    sigma[source] = 1
+    frontier = np.array([source])
+    touched = [frontier]
+    levels = []
+    d = 0
+    while frontier.size:
+        owner, pos = neighbor_positions(indptr, frontier)
+        if alive is not None:
+            owner, pos = owner[alive[edge_ids[pos]]], pos[alive[edge_ids[pos]]]
+        pred, succ = frontier[owner], indices[pos]
+        frontier = np.unique(succ[dist[succ] < 0])
+        dist[frontier] = d + 1
+        dag = dist[succ] == d + 1
+        pred, succ, ids = pred[dag], succ[dag], edge_ids[pos[dag]]
+        np.add.at(sigma, succ, sigma[pred])
+        levels.append([pred, succ, ids])
+        touched.append(frontier)
+        d += 1
+    for level in reversed(levels):
+        pred, succ, ids = level
+        dependency = sigma[pred] / sigma[succ] * (1 + delta[succ])
+        edge_score[ids] += scale * dependency
+        np.add.at(delta, pred, dependency)
+        level.append(dependency)
+    touched = np.concatenate(touched)
+    dist[touched] = -1
+    sigma[touched] = 0
+    delta[touched] = 0
+    return levels
+
+"""
+Edge Betweenness Scores
+
+Input:
+    - The CSR arrays indptr, indices and edge_ids of a graph
+    - An optional iterable of source node indices -- all nodes by default
+
+Output:
+    - A float array indexed by edge id -- the sum of the dependencies of every source on each edge
+
+Runs accumulate_edge_dependencies from every source, reusing the same dist, sigma and delta buffers.
+"""
+def edge_betweenness_scores(indptr, indices, edge_ids, sources=None):
+    n = len(indptr) - 1
+    if sources is None:
+        sources = range(n)
+    dist = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n)
+    delta = np.zeros(n)
+    edge_score = np.zeros(int(edge_ids.max()) + 1 if len(edge_ids) else 0)
+    for s in sources:
+        accumulate_edge_dependencies(indptr, indices, edge_ids, s, dist, sigma, delta, edge_score)
+    return edge_score
+
+# Views of the CSR arrays in shared memory, set once in each worker process by init_betweenness_worker
+worker_graph = None
+
+def init_betweenness_worker(name, n, num_entries):
+    global worker_graph
+    block = shared_memory.SharedMemory(name=name)
+    indptr = np.ndarray(n + 1, dtype=np.int64, buffer=block.buf)
+    indices = np.ndarray(num_entries, dtype=np.int64, buffer=block.buf, offset=8 * (n + 1))
+    edge_ids = np.ndarray(num_entries, dtype=np.int64, buffer=block.buf, offset=8 * (n + 1 + num_entries))
+    # The block is kept alongside its views so it stays mapped for the life of the worker
+    worker_graph = (block, indptr, indices, edge_ids)
+
+"""
+Simple function to run the sources of one task in a worker, accumulating into a private edge score array.
+"""
+def betweenness_task(sources):
+    _, indptr, indices, edge_ids = worker_graph
+    return edge_betweenness_scores(indptr, indices, edge_ids, sources)
+
+"""
+Parallel Edge Betweenness Scores
+
+Input:
+    - The CSR arrays indptr, indices and edge_ids of a graph
+    - An integer workers -- the number of processes to use
+
+Output:
+    - A float array indexed by edge id, the same as edge_betweenness_scores
+
+The CSR arrays are copied once into a shared memory block that every worker maps, so the graph is neither pickled nor copied per task.
+The sources are dealt out round-robin into one task per worker, which keeps the tasks balanced when nearby nodes have similar costs,
+and each worker accumulates into its own NumPy edge score array. The per-worker arrays are summed once at the end.
+"""
+def parallel_edge_betweenness_scores(indptr, indices, edge_ids, workers):
+    n, num_entries = len(indptr) - 1, len(indices)
+    block = shared_memory.SharedMemory(create=True, size=max(8 * (n + 1 + 2 * num_entries), 1))
+    try:
+        np.ndarray(n + 1, dtype=np.int64, buffer=block.buf)[:] = indptr
+        np.ndarray(num_entries, dtype=np.int64, buffer=block.buf, offset=8 * (n + 1))[:] = indices
+        np.ndarray(num_entries, dtype=np.int64, buffer=block.buf, offset=8 * (n + 1 + num_entries))[:] = edge_ids
+        tasks = [np.arange(first, n, workers) for first in range(workers)]
+        edge_score = np.zeros(int(edge_ids.max()) + 1 if num_entries else 0)
+        with ProcessPoolExecutor(workers, initializer=init_betweenness_worker, initargs=(block.name, n, num_entries)) as pool:
+            for partial in pool.map(betweenness_task, tasks):
+                edge_score += partial
+        return edge_score
+    finally:
+        block.close()
+        block.unlink()
+
+"""
+Sampled Edge Betweenness Scores
+
+Input:
+    - The CSR arrays indptr, indices and edge_ids of a graph
+    - An integer k -- the number of pivot sources to accumulate from
+    - An optional string sampling -- "uniform" (default) picks pivots uniformly at random, "degree" stratifies them by degree
+    - An optional numpy Generator or seed called rng
+    - An optional integer strata -- the number of degree strata used by "degree" sampling
+
+Output:
+    - A float array indexed by edge id -- an unbiased estimate of edge_betweenness_scores
+    - A float array indexed by edge id -- the standard error of each estimate
+    - The number of pivots actually used
+
+Pivots are drawn without replacement. With "degree" sampling the nodes are split into degree quantiles, each stratum
+gets a share of the k pivots in proportion to its size (at least two), and the sum of a stratum's dependencies is scaled by
+its size over its number of pivots; with "uniform" sampling there is one stratum, so the sum is scaled by |V| / k.
+The standard error comes from the sample variance of the per-pivot dependencies within each stratum.
+"""
+def sampled_edge_betweenness_scores(indptr, indices, edge_ids, k, sampling="uniform", rng=None, strata=4):
+    n = len(indptr) - 1
+    rng = np.random.default_rng(rng)
+    if sampling == "degree":
+        degree = np.diff(indptr)
+        cuts = np.quantile(degree, np.linspace(0, 1, strata + 1)[1:-1])
+        label = np.searchsorted(cuts, degree, side="right")
+    else:
+        label = np.zeros(n, dtype=np.int64)
+    dist = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n)
+    delta = np.zeros(n)
+    m = int(edge_ids.max()) + 1 if len(edge_ids) else 0
+    estimate = np.zeros(m)
+    variance = np.zeros(m)
+    used = 0
+    for stratum in np.unique(label):
+        members = np.flatnonzero(label == stratum)
+        size = len(members)
+        k_h = min(size, max(2, round(k * size / n)))
+        pivot_sum = np.zeros(m)
+        pivot_sq_sum = np.zeros(m)
+        for s in rng.choice(members, k_h, replace=False):
+            for pred, succ, ids, dependency in accumulate_edge_dependencies(indptr, indices, edge_ids, s, dist, sigma, delta, pivot_sum):
+                pivot_sq_sum[ids] += dependency ** 2
+        estimate += size / k_h * pivot_sum
+        if 1 < k_h < size:
+            sample_variance = np.maximum(pivot_sq_sum - pivot_sum ** 2 / k_h, 0) / (k_h - 1)
+            variance += size ** 2 * (1 - k_h / size) * sample_variance / k_h
+        used += k_h
+    return estimate, np.sqrt(variance), used
+
+"""
+Simple function giving the number of pivots needed so that, with probability at least 1 - delta, every edge's sampled
+betweenness is within epsilon of its exact value, both normalized by |V|(|V| - 1) / 2 as networkX does (a Hoeffding bound over all edges,
+since each pivot contributes at most |V| - 1 to an edge).
+"""
+def pivots_for_epsilon(num_edges, epsilon, delta=0.1):
+    return ceil(log(2 * max(num_edges, 1) / delta) / (2 * epsilon ** 2))
+
 """
 Calculate Edge Betweenness Centrality
 
 Input:
     - A networkX graph object called G
+    - An optional string method -- "brandes" (default) accumulates over CSR arrays, "bfs" uses BFS, num_shortest_path and calculate_edge_weights
+    - An optional integer k -- if given, accumulate from k sampled pivots instead of every source (see sampled_edge_betweenness_scores)
+    - An optional float epsilon -- if given instead of k, use enough pivots to be within epsilon of the normalized betweenness with probability 1 - delta
+    - An optional float delta -- the failure probability for epsilon
+    - An optional string sampling -- "uniform" or "degree", how pivots are picked
+    - An optional seed or numpy Generator for the pivot sampling
+    - An optional integer workers -- if greater than 1, exact "brandes" betweenness is accumulated across this many processes (see parallel_edge_betweenness_scores)
 
 This function has no output.
 
 This function will compute the edge betweenness centrality of each edge in G, and store these values in the edge attributes of the input graph.
+When pivots are sampled, the standard error of each estimate is also stored in the 'betweenness_stderr' edge attribute.
 """
-def calculate_edge_betweenness_centrality(g):
+def calculate_edge_betweenness_centrality(g, method="brandes", k=None, epsilon=None, delta=0.1, sampling="uniform", seed=None, workers=None):
+    if epsilon is not None and k is None:
+        k = pivots_for_epsilon(g.number_of_edges(), epsilon, delta)
+    if k is not None and k < g.number_of_nodes():
+        nodes, edges, indptr, indices, edge_ids = edge_csr(g)
+        edge_score, std_error, _ = sampled_edge_betweenness_scores(indptr, indices, edge_ids, k, sampling, seed)
+        nx.set_edge_attributes(g, {e: edge_score[i] / 2 for i, e in enumerate(edges)}, 'betweenness')
+        nx.set_edge_attributes(g, {e: std_error[i] / 2 for i, e in enumerate(edges)}, 'betweenness_stderr')
+        return
+    if method == "brandes":
+        nodes, edges, indptr, indices, edge_ids = edge_csr(g)
+        if workers is not None and workers > 1:
+            edge_score = parallel_edge_betweenness_scores(indptr, indices, edge_ids, workers)
+        else:
+            edge_score = edge_betweenness_scores(indptr, indices, edge_ids)
+        nx.set_edge_attributes(g, {e: edge_score[i] / 2 for i, e in enumerate(edges)}, 'betweenness')
+        return
     for e in g.edges():
         g.edges[e]['betweenness'] = 0
     for n in g.nodes():
@@ -110,6 +364,109 @@ def calculate_edge_betweenness_centrality(g):
     for e in g.edges():
         g.edges[e]['betweenness'] /= 2
 
+"""
+Incremental Edge Betweenness -- Edge betweenness that is kept up to date as edges are removed
+
+Input:
+    - A networkX graph object called G
+    - An optional integer max_memory -- the most bytes used to keep the dependencies of each source on its DAG edges
+
+Removing the edge (a, b) can only change the shortest paths from a source s if (a, b) is in the shortest-path DAG of s,
+which is exactly when the distances from s to a and to b differ by one. Every other source keeps its DAG and its dependencies,
+so only the dependencies of the affected sources are subtracted and recomputed without the edge.
+The distance from every source to every node is kept in a |V| x |V| int16 (int32 for large graphs) matrix to make that check,
+and removed edges are masked out of the CSR arrays instead of rebuilding them.
+The dependencies of each source are kept while they fit in max_memory; for the sources beyond it, the old dependencies are
+subtracted by running the source once more before the edge is removed.
+
+Methods:
+    - remove_edge(n1, n2, component) -- remove an edge, only looking for affected sources in component (a set of nodes); returns the number of sources recomputed
+    - max_edge() -- the remaining edge with the highest betweenness
+    - betweenness() -- a dict keyed on the remaining edges with their edge betweenness centrality
+"""
+class IncrementalEdgeBetweenness:
+    def __init__(self, g, max_memory=2**30):
+        self.nodes, self.edges, self.indptr, self.indices, self.edge_ids = edge_csr(g)
+        self.index = {n: i for i, n in enumerate(self.nodes)}
+        self.edge_index = {}
+        for i, (a, b) in enumerate(self.edges):
+            self.edge_index[(a, b)] = i
+            self.edge_index[(b, a)] = i
+        n = len(self.nodes)
+        self.alive = np.ones(len(self.edges), dtype=bool)
+        self.score = np.zeros(len(self.edges))
+        self.dist = np.full((n, n), -1, dtype=np.int16 if n < 2**15 else np.int32)
+        self.buffers = (np.full(n, -1, dtype=np.int64), np.zeros(n), np.zeros(n))
+        self.dependencies = [None] * n
+        self.memory_left = max_memory
+        for s in range(n):
+            self.accumulate(s, 1)
+
+    def accumulate(self, s, scale):
+        levels = accumulate_edge_dependencies(self.indptr, self.indices, self.edge_ids, s, *self.buffers, self.score, self.alive, scale)
+        if scale < 0:
+            return
+        row = self.dist[s]
+        row[:] = -1
+        row[s] = 0
+        for d, (_, succ, _, _) in enumerate(levels):
+            row[succ] = d + 1
+        if self.dependencies[s] is not None:
+            self.memory_left += self.dependencies[s][0].nbytes + self.dependencies[s][1].nbytes
+            self.dependencies[s] = None
+        ids = np.concatenate([level[2] for level in levels]).astype(np.int32) if levels else np.zeros(0, dtype=np.int32)
+        values = np.concatenate([level[3] for level in levels]) if levels else np.zeros(0)
+        if ids.nbytes + values.nbytes <= self.memory_left:
+            self.dependencies[s] = (ids, values)
+            self.memory_left -= ids.nbytes + values.nbytes
+
+    def subtract(self, s):
+        if self.dependencies[s] is None:
+            self.accumulate(s, -1)
+        else:
+            ids, values = self.dependencies[s]
+            self.score[ids] -= values
+
+    def remove_edge(self, n1, n2, component=None):
+        e = self.edge_index[(n1, n2)]
+        a, b = self.index[n1], self.index[n2]
+        sources = np.arange(len(self.nodes)) if component is None else np.array([self.index[n] for n in component])
+        dist_a, dist_b = self.dist[sources, a].astype(np.int64), self.dist[sources, b].astype(np.int64)
+        affected = sources[(dist_a >= 0) & (np.abs(dist_a - dist_b) == 1)]
+        for s in affected:
+            self.subtract(s)
+        self.alive[e] = False
+        self.score[e] = 0
+        for s in affected:
+            self.accumulate(s, 1)
+        return len(affected)
+
+    def max_edge(self):
+        if not self.alive.any():
+            return None
+        return self.edges[int(np.argmax(np.where(self.alive, self.score, -np.inf)))]
+
+    def betweenness(self):
+        return {e: self.score[i] / 2 for i, e in enumerate(self.edges) if self.alive[i]}
+
+"""
+Test Betweenness -- A check that the "brandes" and "bfs" methods of calculate_edge_betweenness_centrality agree
+
+Input:
+    - A networkX graph object called G
+
+Output:
+    - A boolean value -- true if both methods give every edge the same betweenness
+"""
+def test_betweenness(g):
+    g1, g2 = g.copy(), g.copy()
+    calculate_edge_betweenness_centrality(g1, "brandes")
+    calculate_edge_betweenness_centrality(g2, "bfs")
+    b1, b2 = nx.get_edge_attributes(g1, 'betweenness'), nx.get_edge_attributes(g2, 'betweenness')
+    passed = sum(abs(b1[e] - b2[e]) <= 1e-9 * max(1, b2[e]) for e in b2)
+    print(f"{passed} / {len(b2)} edges have the same betweenness.")
+    return passed == len(b2)
+
 """
 Path Exists
 
@@ -151,8 +508,11 @@ Output:
     - A boolean value -- true if n1 is in the same set as n2, otherwise false
 
 This function detects whether two nodes are in the same connected component of a graph.
+components may also be a ComponentIndex, in which case the check is a comparison of two component ids.
 """
 def same_component(components, n1, n2):
+    if isinstance(components, ComponentIndex):
+        return components.same_component(n1, n2)
     n1_comp = set()
     for n_set in components:
         if n1 in n_set:
@@ -161,28 +521,72 @@ def same_component(components, n1, n2):
     return n2 in n1_comp
 
 """
-Same Component
+Modularity
 
 Input:
     - A networkX graph object called g
-    - A list of sets of node names, representing the connected components of a graph
+    - A list of sets of node names, or a ComponentIndex, representing the connected components of a graph
 
 Output:
     - A float value -- the calculated modularity of g
 
 This function uses the graph, g, and the given partitioning of the graph into communities, components, to calculate the modularity of g.
+Summing A - d1*d2 / 2m over every pair of nodes in the same community only depends on each community's internal edges and degree sum,
+so the value is computed by a ModularityTracker in O(|V| + |E|) rather than by visiting every pair of nodes.
 """
 def modularity(g, components):
-    sum_stuff = 0
-    m = g.number_of_edges()
-    for n1 in g.nodes:
-        for n2 in g.nodes:
-            if same_component(components, n1, n2):
-                A = g.has_edge(n1, n2)
-                d1 = g.degree(n1)
-                d2 = g.degree(n2)
-                sum_stuff += A - (d1*d2 / (2 * m))
-    return sum_stuff / (2 * m)
+    if isinstance(components, ComponentIndex):
+        components = components.components()
+    return ModularityTracker(g, components).modularity()
+
+"""
+Modularity Tracker -- The modularity of a partition of g, kept up to date as communities split
+
+Input:
+    - A networkX graph object called g
+    - A list of sets of node names, representing the communities
+
+For each community c the tracker keeps A_c, the number of ordered pairs of adjacent nodes inside c (twice its internal edges),
+and D_c, the sum of the degrees in g of its nodes. The modularity is then
+
+    Q = sum over c of (A_c - D_c^2 / 2m) / 2m
+
+Splitting a community only changes the terms of that community and its parts, so Q is updated by recounting the
+edges inside the split community, in time proportional to the split community rather than the whole graph.
+
+Communities are given ids in the order they are added, starting from 0.
+
+Methods:
+    - split(community, new_components) -- replace the community with id community by the communities in new_components; returns their ids
+    - modularity() -- the current value of Q
+"""
+class ModularityTracker:
+    def __init__(self, g, components):
+        self.g = g
+        self.m = g.number_of_edges()
+        self.terms = {}
+        self.q = 0
+        self.next_id = 0
+        for component in components:
+            self.add(component)
+
+    def add(self, component):
+        community = self.next_id
+        self.next_id += 1
+        adj = self.g.adj
+        internal = sum(1 for n in component for n1 in adj[n] if n1 in component)
+        degree_sum = sum(self.g.degree(n) for n in component)
+        term = (internal - degree_sum ** 2 / (2 * self.m)) / (2 * self.m) if self.m else 0
+        self.terms[community] = term
+        self.q += term
+        return community
+
+    def split(self, community, new_components):
+        self.q -= self.terms.pop(community)
+        return [self.add(new_component) for new_component in new_components]
+
+    def modularity(self):
+        return self.q
 
 """
 Detect Connected Components
@@ -203,56 +607,470 @@ def detect_connected_components(g, all_nodes = {}):
     else: all_nodes = all_nodes.copy()
     adj_list = dict(g.adj)
     while all_nodes:
-        visited = set()
         stack = [all_nodes.pop()]
-        all_nodes.add(stack[0])
+        # Nodes are marked when they are pushed, so a node is never pushed twice and no scan of the stack is needed
+        visited = {stack[0]}
         while stack:
             current = stack.pop()
-            visited.add(current)
-            all_nodes.remove(current)
             for n in adj_list[current]:
-                if n not in stack and n not in visited:
+                if n not in visited:
+                    visited.add(n)
                     stack.append(n)
+        all_nodes -= visited
         components.append(visited)
     return components
 
+"""
+Component Index -- The connected components of a graph, indexed by node, kept up to date as edges are removed
+
+Input:
+    - A networkX graph object called g
+
+Every node has its component id stored in an integer array, so finding a node's component or comparing two nodes'
+components takes O(1) rather than a scan through a list of sets. Components are numbered from 0 in the order they are found,
+and each split gives its two parts the next two ids, the part containing the first end of the removed edge first.
+
+When an edge is removed, two breadth-first searches are run over the CSR arrays of g, one level at a time, from both of its ends.
+If they meet, the component is still connected. Otherwise the search that runs out of nodes first has found the smaller part,
+and only the nodes of that part are relabelled, so a split costs time proportional to the smaller part rather than the whole component.
+(Nodes point to a group, and groups to a component id, so the larger part is renamed by changing the id of its group.)
+Removed edges are masked out of the CSR arrays; the graph g itself is not changed.
+The node sets are frozensets, and a split builds new ones for both parts, so sets handed out earlier never change.
+
+Methods:
+    - component_id(n) -- the id of the component of node n
+    - same_component(n1, n2) -- true if n1 and n2 are in the same component
+    - members(component) -- the frozenset of nodes in a component
+    - components() -- a list of the frozensets of nodes of every component
+    - remove_edge(n1, n2) -- remove an edge; returns (parent id, (child id, child id)) if its component split, otherwise None.
+      Raises NetworkXError if the edge is not in g or was already removed
+"""
+class ComponentIndex:
+    def __init__(self, g):
+        self.nodes, self.edges, self.indptr, self.indices, self.edge_ids = edge_csr(g)
+        self.index = {n: i for i, n in enumerate(self.nodes)}
+        self.edge_index = {}
+        for i, (a, b) in enumerate(self.edges):
+            self.edge_index[(a, b)] = i
+            self.edge_index[(b, a)] = i
+        n = len(self.nodes)
+        self.alive = np.ones(len(self.edges), dtype=bool)
+        self.group = np.full(n, -1, dtype=np.int64)
+        self.group_component = []
+        self.seen = np.zeros((2, n), dtype=np.int64)
+        self.stamp = 0
+        self.member_sets = {}
+        for start in range(n):
+            if self.group[start] < 0:
+                self.stamp += 1
+                frontier = np.array([start])
+                self.seen[0, start] = self.stamp
+                reached = [frontier]
+                while frontier.size:
+                    frontier = self.expand(frontier, 0)
+                    reached.append(frontier)
+                reached = np.concatenate(reached)
+                self.group[reached] = len(self.group_component)
+                self.member_sets[len(self.group_component)] = frozenset(self.nodes[i] for i in reached)
+                self.group_component.append(len(self.group_component))
+        self.next_id = len(self.group_component)
+
+    # One level of a search: the unseen nodes adjacent to frontier through edges that have not been removed
+    def expand(self, frontier, side):
+        owner, pos = neighbor_positions(self.indptr, frontier)
+        succ = self.indices[pos[self.alive[self.edge_ids[pos]]]]
+        frontier = np.unique(succ[self.seen[side, succ] != self.stamp])
+        self.seen[side, frontier] = self.stamp
+        return frontier
+
+    def component_id(self, n):
+        return self.group_component[self.group[self.index[n]]]
+
+    def same_component(self, n1, n2):
+        return self.component_id(n1) == self.component_id(n2)
+
+    def members(self, component):
+        return self.member_sets[component]
+
+    def components(self):
+        return list(self.member_sets.values())
+
+    def remove_edge(self, n1, n2):
+        edge = self.edge_index.get((n1, n2))
+        if edge is None or not self.alive[edge]:
+            raise nx.NetworkXError(f"The edge {n1}-{n2} is not in the graph")
+        self.alive[edge] = False
+        a, b = self.index[n1], self.index[n2]
+        if a == b:
+            return None
+        self.stamp += 1
+        self.seen[0, a] = self.seen[1, b] = self.stamp
+        frontiers = [np.array([a]), np.array([b])]
+        reached = [[frontiers[0]], [frontiers[1]]]
+        while True:
+            for side in (0, 1):
+                frontier = self.expand(frontiers[side], side)
+                if (self.seen[1 - side, frontier] == self.stamp).any():
+                    return None
+                if not frontier.size:
+                    return self.split(np.concatenate(reached[side]), side)
+                frontiers[side] = frontier
+                reached[side].append(frontier)
+
+    def split(self, part, side):
+        old_group = self.group[part[0]]
+        parent = self.group_component[old_group]
+        part_set = frozenset(self.nodes[i] for i in part)
+        rest_set = self.member_sets.pop(parent) - part_set
+        children = (self.next_id, self.next_id + 1)
+        part_id, rest_id = children if side == 0 else children[::-1]
+        self.next_id += 2
+        self.group[part] = len(self.group_component)
+        self.group_component.append(part_id)
+        self.group_component[old_group] = rest_id
+        self.member_sets[children[0]] = part_set if side == 0 else rest_set
+        self.member_sets[children[1]] = rest_set if side == 0 else part_set
+        return parent, children
+
+"""
+Girvan-Newman Splits -- The Girvan-Newman algorithm as a generator of community splits
+
+Input:
+    - A networkX graph object called g
+    - An optional boolean argument incremental -- if true, edge betweenness is updated with IncrementalEdgeBetweenness instead of being recomputed from every source
+    - An optional integer k -- if given, the edge to remove is chosen from betweenness sampled from k pivots (incremental cannot be used with it)
+    - An optional seed for the pivot sampling
+
+Output:
+    - A generator of dicts, one for each time a community splits in two, with the keys:
+        - "removed_edges" -- the edges removed since the previous split, the last of which caused this split
+        - "sources_recomputed" -- with incremental set, the number of sources recomputed for each removed edge, otherwise None
+        - "parent" -- the id of the community that split
+        - "children" -- the ids of the two new communities
+        - "components" -- the node sets of the two new communities
+        - "modularity" -- the modularity of g with the communities after this split
+
+The first dict describes the connected components of g before any edge is removed, with a parent of None.
+Community ids are assigned in the order communities appear, starting from 0 for the first connected component.
+Edges are removed until none are left, so the last split leaves every node in a community of its own.
+"""
+def girvan_newman_splits(g, incremental = False, k = None, seed = None):
+    if incremental and k is not None:
+        raise ValueError("incremental betweenness cannot be combined with sampled pivots")
+    rng = np.random.default_rng(seed)
+    g2 = g.copy()
+    index = ComponentIndex(g2)
+    connected_components = index.components()
+    # The tracker numbers communities in the order they are added, the same as the component index
+    tracker = ModularityTracker(g, connected_components)
+    yield {"removed_edges": [], "sources_recomputed": None, "parent": None, "children": tuple(range(len(connected_components))), "components": connected_components, "modularity": tracker.modularity()}
+    if incremental:
+        betweenness = IncrementalEdgeBetweenness(g2)
+    removed_edges, sources_recomputed = [], []
+    while not nx.is_empty(g2):
+        if incremental:
+            n1, n2 = betweenness.max_edge()
+        else:
+            calculate_edge_betweenness_centrality(g2, k=k, seed=rng)
+            n1, n2, _ = max(g2.edges(data=True), key=lambda e: e[2]['betweenness'])
+        g2.remove_edge(n1, n2)
+        removed_edges.append((n1, n2))
+        curr_component = index.members(index.component_id(n1))
+        if incremental:
+            sources_recomputed.append(betweenness.remove_edge(n1, n2, curr_component))
+        split = index.remove_edge(n1, n2)
+        if split is not None:
+            parent, children = split
+            new_components = [index.members(child) for child in children]
+            tracker.split(parent, new_components)
+            yield {"removed_edges": removed_edges, "sources_recomputed": sources_recomputed if incremental else None, "parent": parent, "children": children, "components": new_components, "modularity": tracker.modularity()}
+            removed_edges, sources_recomputed = [], []
+
 """
 Girvan-Newman Community Detection Algorithm
 
 Input:
     - A networkX graph object called g
     - An optional float argument mod-bound -- the algorithm will be run until this modularity is reached
+    - An optional boolean argument incremental -- if true, edge betweenness is updated with IncrementalEdgeBetweenness instead of being recomputed from every source
+    - An optional integer k -- if given, the edge to remove is chosen from betweenness sampled from k pivots
+    - An optional seed for the pivot sampling
 
 Output:
     - A new graph that is split into its component communities -- each connected component is one detecte community
+        - With incremental set, its "sources_recomputed" graph attribute lists how many sources were recomputed at each step
+        - Its "modularity" graph attribute lists the modularity of the communities after each step
 
 This algorithm iteratively removes the edge with the highest edge betweenness centrality to detect components in the input graph
 The connected components of the output graph are the detected communities.
+The splits come from girvan_newman_splits, which is stopped at the first split that reaches mod_bound.
 """
-def girvan_newman(g, mod_bound = 0.3):
+def girvan_newman(g, mod_bound = 0.3, incremental = False, k = None, seed = None):
     g2 = g.copy()
-    connected_components = detect_connected_components(g2)
-    while modularity(g, connected_components) < mod_bound and not nx.is_empty(g2):
-        calculate_edge_betweenness_centrality(g2)
-        try:
-            max_edge = max(g2.edges(data=True), key=lambda e: e[2]['betweenness'])
-        except:
-            # print(e2.edges(data=True))
+    g2.graph['modularity'] = []
+    if incremental:
+        g2.graph['sources_recomputed'] = []
+    communities = {}
+    for split in girvan_newman_splits(g, incremental, k, seed):
+        g2.remove_edges_from(split['removed_edges'])
+        if split['parent'] is not None:
+            del communities[split['parent']]
+            g2.graph['modularity'].extend([g2.graph['modularity'][-1]] * (len(split['removed_edges']) - 1))
+            if incremental:
+                g2.graph['sources_recomputed'].extend(split['sources_recomputed'])
+        communities.update(zip(split['children'], split['components']))
+        g2.graph['modularity'].append(split['modularity'])
+        if split['modularity'] >= mod_bound:
             break
-        n1, n2 = max_edge[0:2]
-        g2.remove_edge(n1, n2)
-        curr_component = set()
-        for node_set in connected_components:
-            if n1 in node_set:
-                curr_component = node_set
-                break
-        new_components = detect_connected_components(g2, curr_component)
-        if len(new_components) == 2:
-            connected_components.remove(curr_component)
-            connected_components.extend(new_components)
+    connected_components = [set(component) for component in communities.values()]
     print(connected_components)
     return g2
 
+"""
+Girvan-Newman Dendrogram
+
+Input:
+    - A networkX graph object called g
+    - An optional boolean argument incremental -- passed on to girvan_newman_splits
+
+Output:
+    - A dict object with the keys:
+        - "nodes" -- an array of the nodes of g; node i is leaf i of the dendrogram
+        - "merges" -- a (k x 4) merge matrix; row i joins the clusters in columns 0 and 1 into cluster |V| + i,
+          at the height in column 2, giving a cluster with the number of nodes in column 3
+        - "modularity" -- an array whose j-th value is the modularity after j splits
+
+Every split of girvan_newman_splits is read backwards as a merge, in the same layout as a scipy linkage matrix, so that merge i
+undoes the (k - i)-th split; a graph with c connected components has k = |V| - c merges and is a forest of c trees.
+Because the full run is recorded, the communities at any number of splits or modularity can be read off with cut_dendrogram
+without running the algorithm again.
+"""
+def girvan_newman_dendrogram(g, incremental = False):
+    nodes = list(g.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    splits, q = [], []
+    leaf_of = {}
+    for split in girvan_newman_splits(g, incremental):
+        q.append(split['modularity'])
+        if split['parent'] is not None:
+            splits.append((split['parent'], split['children']))
+        for child, node_set in zip(split['children'], split['components']):
+            if len(node_set) == 1:
+                leaf_of[child] = index[next(iter(node_set))]
+    cluster_of = dict(leaf_of)
+    sizes = {c: 1 for c in leaf_of}
+    merges = np.zeros((len(splits), 4))
+    for i, (parent, (a, b)) in enumerate(reversed(splits)):
+        cluster_of[parent] = len(nodes) + i
+        sizes[parent] = sizes[a] + sizes[b]
+        merges[i] = (cluster_of[a], cluster_of[b], i + 1, sizes[parent])
+    # A 1-D object array keeps tuple and mixed labels as they are in g, where np.array(nodes) would reshape or stringify them
+    labels = np.empty(len(nodes), dtype=object)
+    labels[:] = nodes
+    return {"nodes": labels, "merges": merges, "modularity": np.array(q)}
+
+"""
+Cut Dendrogram
+
+Input:
+    - A dendrogram dict, as returned by girvan_newman_dendrogram or load_dendrogram
+    - An optional integer splits -- the number of Girvan-Newman splits to keep
+    - An optional float mod_bound -- keep splits up to the first one that reaches this modularity, as girvan_newman does
+
+Output:
+    - A list of sets of nodes, the communities at that point
+
+With neither splits nor mod_bound given, the cut with the highest modularity is used.
+"""
+def cut_dendrogram(dendrogram, splits = None, mod_bound = None):
+    nodes, merges, q = dendrogram['nodes'], dendrogram['merges'], dendrogram['modularity']
+    if splits is None:
+        if mod_bound is None:
+            splits = int(np.argmax(q))
+        else:
+            reached = np.flatnonzero(q >= mod_bound)
+            splits = int(reached[0]) if len(reached) else len(q) - 1
+    members = {i: [i] for i in range(len(nodes))}
+    for i, (a, b, _, _) in enumerate(merges[:len(merges) - splits]):
+        members[len(nodes) + i] = members.pop(int(a)) + members.pop(int(b))
+    return [{nodes[i] for i in leaves} for leaves in members.values()]
+
+"""
+Simple functions to write a dendrogram to a compressed .npz file, and to read it back.
+"""
+def save_dendrogram(dendrogram, path):
+    np.savez_compressed(path, **dendrogram)
+
+def load_dendrogram(path):
+    with np.load(path, allow_pickle=True) as data:
+        return {key: data[key] for key in data.files}
+
+"""
+Simple function to build weighted CSR arrays from lists of edge ends and weights, adding each edge in both directions
+(a self-loop (u, u) of weight w gets a single entry of weight 2w, so every row sums to the node's weighted degree).
+"""
+def weighted_csr(n, heads, tails, weights):
+    loops = heads == tails
+    rows = np.concatenate([heads, tails[~loops]])
+    cols = np.concatenate([tails, heads[~loops]])
+    vals = np.concatenate([np.where(loops, 2 * weights, weights), weights[~loops]])
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order], vals[order]
+
+"""
+Louvain Community Detection Algorithm
+
+Input:
+    - A networkX graph object called g
+    - An optional float resolution -- values above 1 favour smaller communities
+    - An optional seed for the order nodes are visited in
+
+Output:
+    - A list of sets of nodes -- the detected communities, in the same shape girvan_newman and modularity use
+
+Each level has two phases. In the local moving phase every node, in random order, moves to the neighbouring community
+that increases modularity the most, given by  k_i,in - resolution * tot * k_i / 2m  for a community with degree sum tot
+that node i, of degree k_i, has k_i,in edge weight into. Passes repeat until no node moves.
+In the aggregation phase every community becomes a single node of a new weighted graph, its internal edges becoming a self-loop,
+and the next level runs on that graph. The algorithm stops once a level moves no nodes, which takes O(|E|) per pass.
+"""
+def louvain_communities(g, resolution = 1, seed = None):
+    nodes, edges, _, _, _ = edge_csr(g)
+    index = {n: i for i, n in enumerate(nodes)}
+    rng = np.random.default_rng(seed)
+    n = len(nodes)
+    heads = np.array([index[a] for a, b in edges], dtype=np.int64)
+    tails = np.array([index[b] for a, b in edges], dtype=np.int64)
+    indptr, indices, weights = weighted_csr(n, heads, tails, np.ones(len(edges)))
+    membership = np.arange(n)
+    while True:
+        community = louvain_local_moving(indptr, indices, weights, resolution, rng)
+        # Renumber the communities 0..c-1
+        _, community = np.unique(community, return_inverse=True)
+        c = community.max(initial=-1) + 1
+        if c == len(indptr) - 1:
+            break
+        membership = community[membership]
+        owner = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        keys = community[owner] * c + community[indices]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.bincount(inverse, weights=weights)
+        indptr = np.zeros(c + 1, dtype=np.int64)
+        np.cumsum(np.bincount(unique_keys // c, minlength=c), out=indptr[1:])
+        indices, weights = unique_keys % c, summed
+    communities = {}
+    for i, label in enumerate(membership):
+        communities.setdefault(label, set()).add(nodes[i])
+    return list(communities.values())
+
+"""
+Simple function running the local moving phase of Louvain on weighted CSR arrays (where self-loop entries already count twice).
+Returns an array with the community of every node.
+"""
+def louvain_local_moving(indptr, indices, weights, resolution, rng):
+    n = len(indptr) - 1
+    degree = np.bincount(np.repeat(np.arange(n), np.diff(indptr)), weights=weights, minlength=n).tolist()
+    two_m = sum(degree)
+    if two_m == 0:
+        return np.arange(n)
+    community = list(range(n))
+    total = list(degree)
+    indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+    moved = True
+    while moved:
+        moved = False
+        for i in rng.permutation(n).tolist():
+            own = community[i]
+            k_i = degree[i]
+            links = {}
+            for j in range(indptr[i], indptr[i + 1]):
+                neighbor = indices[j]
+                if neighbor != i:
+                    links[community[neighbor]] = links.get(community[neighbor], 0) + weights[j]
+            total[own] -= k_i
+            best, best_gain = own, links.get(own, 0) - resolution * total[own] * k_i / two_m
+            for candidate, link in links.items():
+                gain = link - resolution * total[candidate] * k_i / two_m
+                if gain > best_gain + 1e-12:
+                    best, best_gain = candidate, gain
+            total[best] += k_i
+            if best != own:
+                community[i] = best
+                moved = True
+    return np.array(community)
+
+"""
+Label Propagation Community Detection Algorithm
+
+Input:
+    - A networkX graph object called g
+    - An optional seed for the order nodes are visited in and for breaking ties
+    - An optional integer max_sweeps -- the most passes over the nodes
+
+Output:
+    - A list of sets of nodes -- the detected communities, in the same shape girvan_newman and modularity use
+
+Every node starts with its own label, and nodes repeatedly take the label that is most common among their neighbours,
+in a random order, until no label changes. Each pass is O(|E|), and a few passes are usually enough,
+so it is the fastest engine here, at some cost in modularity compared to Louvain.
+"""
+def label_propagation_communities(g, seed = None, max_sweeps = 100):
+    nodes, _, indptr, indices, _ = edge_csr(g)
+    rng = np.random.default_rng(seed)
+    n = len(nodes)
+    label = list(range(n))
+    indptr, indices = indptr.tolist(), indices.tolist()
+    for _ in range(max_sweeps):
+        changed = False
+        for i in rng.permutation(n).tolist():
+            counts = {}
+            for j in range(indptr[i], indptr[i + 1]):
+                counts[label[indices[j]]] = counts.get(label[indices[j]], 0) + 1
+            if not counts:
+                continue
+            most = max(counts.values())
+            if counts.get(label[i], 0) == most:
+                continue
+            best = [l for l, count in counts.items() if count == most]
+            label[i] = best[rng.integers(len(best))]
+            changed = True
+        if not changed:
+            break
+    communities = {}
+    for i, l in enumerate(label):
+        communities.setdefault(l, set()).add(nodes[i])
+    return list(communities.values())
+
+"""
+Test Incremental Betweenness -- A check of IncrementalEdgeBetweenness against full recomputation
+
+Input:
+    - A networkX graph object called G
+    - An optional integer steps -- the number of highest-betweenness edges to remove
+
+Output:
+    - A boolean value -- true if after every removal the incremental betweenness matches calculate_edge_betweenness_centrality
+"""
+def test_incremental_betweenness(g, steps=10):
+    g2 = g.copy()
+    betweenness = IncrementalEdgeBetweenness(g2)
+    passed = 0
+    for step in range(steps):
+        if nx.is_empty(g2):
+            steps = step
+            break
+        n1, n2 = betweenness.max_edge()
+        g2.remove_edge(n1, n2)
+        recomputed = betweenness.remove_edge(n1, n2)
+        calculate_edge_betweenness_centrality(g2)
+        incremental = betweenness.betweenness()
+        passed += all(abs(incremental[e] - b) <= 1e-6 * max(1, b) for e, b in nx.get_edge_attributes(g2, 'betweenness').items())
+        print(f"Removed {(n1, n2)}, recomputed {recomputed} / {g2.number_of_nodes()} sources")
+    print(f"{passed} / {steps} removals match full recomputation.")
+    return passed == steps
+
 """
 Simple utility function to round a dictionary with floating point values to two decimal places.
 """
@@ -310,6 +1128,88 @@ def random_community_structure(num_communities, community_sizes, intra_community
 
     return nx.generators.community.stochastic_block_model(arg1, arg2)
 
+"""
+Benchmark Sampled Choice -- How often sampled betweenness picks the same edge to remove as exact betweenness
+
+Input:
+    - An optional list of pivot counts ks to try
+    - An optional integer num_graphs -- the number of random_community_structure graphs to run on
+    - An optional integer steps -- the number of Girvan-Newman edge removals followed on each graph
+    - An optional string sampling -- "uniform" or "degree"
+    - Optional arguments num_communities and community_sizes passed on to random_community_structure
+
+Output:
+    - A dict keyed on each k (and "exact") with the fraction of steps where the sampled choice matched, the average exact
+      betweenness of the sampled choice as a fraction of the highest exact betweenness, and the average seconds per step
+
+Each graph is taken through steps removals of its exact highest-betweenness edge; at every step, the betweenness is also
+sampled once for each k and the highest-betweenness edge of each sample is compared with the exact one.
+Several edges between the same pair of communities often have nearly equal betweenness, so the ratio shows how close
+a mismatched choice was.
+"""
+def benchmark_sampled_choice(ks = (8, 16, 32, 64), num_graphs = 5, steps = 20, sampling = "uniform", num_communities = 8, community_sizes = (20, 40)):
+    matches = {k: 0 for k in ks}
+    ratios = {k: 0 for k in ks}
+    seconds = {k: 0 for k in ks}
+    seconds["exact"] = 0
+    total = 0
+    rng = np.random.default_rng()
+    for _ in range(num_graphs):
+        g = random_community_structure(num_communities, community_sizes)
+        for _ in range(steps):
+            if nx.is_empty(g):
+                break
+            nodes, edges, indptr, indices, edge_ids = edge_csr(g)
+            start = perf_counter()
+            exact_scores = edge_betweenness_scores(indptr, indices, edge_ids)
+            exact = int(np.argmax(exact_scores))
+            seconds["exact"] += perf_counter() - start
+            for k in ks:
+                start = perf_counter()
+                sampled, _, _ = sampled_edge_betweenness_scores(indptr, indices, edge_ids, k, sampling, rng)
+                seconds[k] += perf_counter() - start
+                choice = int(np.argmax(sampled))
+                matches[k] += choice == exact
+                ratios[k] += exact_scores[choice] / exact_scores[exact]
+            g.remove_edge(*edges[exact])
+            total += 1
+    results = {"exact": {"match_rate": 1.0, "betweenness_ratio": 1.0, "seconds_per_step": seconds["exact"] / total}}
+    print(f"exact: {seconds['exact'] / total:.4f} s per step")
+    for k in ks:
+        results[k] = {"match_rate": matches[k] / total, "betweenness_ratio": ratios[k] / total, "seconds_per_step": seconds[k] / total}
+        print(f"k = {k}: sampled choice matches exact in {matches[k]} / {total} steps (average betweenness ratio {ratios[k] / total:.3f}), {seconds[k] / total:.4f} s per step")
+    return results
+
+"""
+Benchmark Community Engines -- Modularity and wall time of girvan_newman, Louvain and label propagation as graphs grow
+
+Input:
+    - An optional list of community counts -- one random_community_structure graph is generated for each
+    - An optional integer community_size -- the number of nodes in each community
+    - An optional float inter_degree -- the expected number of edges from a node to other communities
+    - An optional integer girvan_newman_max_nodes -- Girvan-Newman is skipped on larger graphs
+
+Output:
+    - A list of dicts, one per graph and engine, with the number of nodes and edges, the modularity reached and the seconds taken
+
+Girvan-Newman runs to completion with incremental betweenness, and its best cut is taken from the dendrogram, so it is timed for the whole dendrogram.
+"""
+def benchmark_community_engines(community_counts = (4, 8, 16, 32, 64), community_size = 25, inter_degree = 2, girvan_newman_max_nodes = 200):
+    results = []
+    for num_communities in community_counts:
+        n = num_communities * community_size
+        g = random_community_structure(num_communities, community_size, intra_community_connections=0.3, inter_community_connections=inter_degree / max(n - community_size, 1))
+        engines = [("louvain", louvain_communities), ("label_propagation", label_propagation_communities)]
+        if n <= girvan_newman_max_nodes:
+            engines.insert(0, ("girvan_newman", lambda g: cut_dendrogram(girvan_newman_dendrogram(g, incremental=True))))
+        for name, engine in engines:
+            start = perf_counter()
+            communities = engine(g)
+            seconds = perf_counter() - start
+            results.append({"engine": name, "nodes": n, "edges": g.number_of_edges(), "modularity": modularity(g, communities), "communities": len(communities), "seconds": seconds})
+            print(f"{name:>18}: {n:6} nodes, {g.number_of_edges():7} edges, modularity {results[-1]['modularity']:.3f}, {len(communities):4} communities, {seconds:.3f} s")
+    return results
+
 ########################################################################################################
 #  To Run a Test case, uncomment it and leave the others commented.
 ########################################################################################################
@@ -330,19 +1230,40 @@ G1 = random_community_structure(5, (4, 10))
 # G1 = random_community_structure(5, (5, 15))
 
 # Runs the test cases above
-test(G1, 0.5)
-
-# Test 6
-# G1 = nx.fast_gnp_random_graph(100, 0.02)
-# isolated_nodes = list(nx.isolates(G1))
-# G1.remove_nodes_from(isolated_nodes)
-# Test 7
-# G1 = nx.fast_gnp_random_graph(40, 0.1)
-# isolated_nodes = list(nx.isolates(G1))
-# G1.remove_nodes_from(isolated_nodes)
-# Test 8
-# G1 = nx.fast_gnp_random_graph(20, 0.1)
-# isolated_nodes = list(nx.isolates(G1))
-# G1.remove_nodes_from(isolated_nodes)
-
-# test(G1, show_ebc=True)
+if __name__ == "__main__":
+    test(G1, 0.5)
+
+    # Test 6
+    # G1 = nx.fast_gnp_random_graph(100, 0.02)
+    # isolated_nodes = list(nx.isolates(G1))
+    # G1.remove_nodes_from(isolated_nodes)
+    # Test 7
+    # G1 = nx.fast_gnp_random_graph(40, 0.1)
+    # isolated_nodes = list(nx.isolates(G1))
+    # G1.remove_nodes_from(isolated_nodes)
+    # Test 8
+    # G1 = nx.fast_gnp_random_graph(20, 0.1)
+    # isolated_nodes = list(nx.isolates(G1))
+    # G1.remove_nodes_from(isolated_nodes)
+
+    # test(G1, show_ebc=True)
+
+    # Checks the array-backed betweenness against the original breadth-first search version
+    # test_betweenness(G1)
+
+    # Checks the incremental betweenness updates used by girvan_newman(G1, incremental=True) against full recomputation
+    # test_incremental_betweenness(G1)
+
+    # Records the full Girvan-Newman dendrogram once, then reads off the communities with the highest modularity
+    # dendrogram = girvan_newman_dendrogram(G1, incremental=True)
+    # print(cut_dendrogram(dendrogram))
+
+    # Compares the edge picked with betweenness sampled from k pivots against the exact choice
+    # benchmark_sampled_choice()
+
+    # Accumulates exact edge betweenness across 4 processes sharing the graph's CSR arrays
+    # calculate_edge_betweenness_centrality(G1, workers=4)
+
+    # Detects communities with Louvain, and compares the engines on growing graphs
+    # print(louvain_communities(G1))
+    # benchmark_community_engines()
@@ -1,14 +1,19 @@
 import networkx as nx
 import numpy as np
-import matplotlib.pyplot as plt
 import math
 import random
+import json
+import tracemalloc
+from time import perf_counter
 from collections import deque
+from heapq import heappush, heappop
+from concurrent.futures import ProcessPoolExecutor
 
-# Inputs: A graph to run Bellman-Ford on and a start node
+# Inputs: A graph to run Bellman-Ford on and a start node.
+#         stats, an optional dict that gets the number of edge relaxations tried under "relaxations"
 # Outputs: The graph with the lowest cost to reach each node
 #          stored at it's nodes
-def bellman_ford(G, start):
+def bellman_ford(G, start, stats=None):
     # Set cost associated with start node to 0, others to infinity
     for node in G.nodes:
         if node == start:
@@ -27,6 +32,10 @@ def bellman_ford(G, start):
             if cost_u + edge_weight < cost_v:
                 G.nodes[v]['cost'] = cost_u + edge_weight
 
+    # Every edge is relaxed in each of the |V| - 1 passes and once more in the check below
+    if stats is not None:
+        stats["relaxations"] = len(G) * G.number_of_edges()
+
     # If another relaxation yields better results there is a negative cycle    
     for (u, v, data) in G.edges.data():
             if G.nodes[u]["cost"] + data["weight"] < G.nodes[v]["cost"]:
@@ -35,6 +44,382 @@ def bellman_ford(G, start):
     return G
 
 
+# Converts a graph into flat arrays for the array-backed engines below.
+# Inputs: A graph with a "weight" on every edge
+# Outputs: The list of nodes, and arrays src, dst and weight with one entry per edge,
+#          sorted by src, where src and dst are positions in the node list,
+#          plus an array indptr so the edges leaving node i are indptr[i]:indptr[i + 1]
+def graph_to_arrays(G):
+    nodes = list(G.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    m = G.number_of_edges()
+    src = np.fromiter((index[u] for u, v in G.edges()), dtype=np.int64, count=m)
+    dst = np.fromiter((index[v] for u, v in G.edges()), dtype=np.int64, count=m)
+    weight = np.fromiter((data["weight"] for u, v, data in G.edges.data()), dtype=np.float64, count=m)
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(nodes)), out=indptr[1:])
+    return nodes, src[order], dst[order], weight[order], indptr
+
+
+# Finds the positions of the edges leaving every node in frontier, for edges sorted by src
+def out_edges(indptr, frontier):
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets
+
+
+# Bellman-Ford on arrays, relaxing edges in vectorized rounds.
+# Inputs: The number of nodes, the arrays from graph_to_arrays, the position of the start node
+#         and an optional stats dict, as in bellman_ford
+# Outputs: An array of the lowest cost to reach each node (inf if unreachable),
+#          or None if a negative cycle is reachable from the start node
+def bellman_ford_arrays(n, src, dst, weight, indptr, start, stats=None):
+    dist = np.full(n, np.inf)
+    dist[start] = 0
+    # pred[i] is the node whose edge last lowered dist[i], with n standing in for "none"
+    pred = np.full(n + 1, n)
+    changed = np.array([start])
+    if stats is not None:
+        stats["relaxations"] = 0
+    # Round r finds every path with r edges, and only edges out of nodes that improved
+    # in the previous round can improve anything, so those are the only ones relaxed
+    for i in range(n):
+        edges = out_edges(indptr, changed)
+        if stats is not None:
+            stats["relaxations"] += len(edges)
+        candidate = dist[src[edges]] + weight[edges]
+        better = candidate < dist[dst[edges]]
+        if not better.any():
+            return dist
+        # After |V| - 1 rounds every shortest path has been found, so any improvement means a negative cycle
+        if i == n - 1:
+            return None
+        edges, candidate = edges[better], candidate[better]
+        np.minimum.at(dist, dst[edges], candidate)
+        won = candidate == dist[dst[edges]]
+        pred[dst[edges[won]]] = src[edges[won]]
+        changed = np.unique(dst[edges])
+        # A cycle among the pred pointers is always a negative cycle, so checking for one
+        # every power of two rounds stops early instead of running all |V| rounds
+        if i & (i + 1) == 0 and has_pred_cycle(pred):
+            return None
+    return dist
+
+
+# Checks whether following pred pointers from some node loops forever.
+# pred holds a node index for each node, and a final entry n that points to itself
+def has_pred_cycle(pred):
+    n = len(pred) - 1
+    jump = pred.copy()
+    # After k squarings, jump[i] is 2^k steps along the pointers from i, and a node that
+    # never reaches n within n steps must be on or lead into a cycle
+    for _ in range(max(n, 1).bit_length()):
+        jump = jump[jump]
+    return bool((jump[:n] != n).any())
+
+
+# Inputs: A graph to run Bellman-Ford on and a start node.
+#         If return_array is true, the costs are returned as an array in the order of G.nodes
+#         instead of being stored on the nodes. stats is an optional dict, as in bellman_ford
+# Outputs: The same as bellman_ford: the graph with the lowest cost to reach each node
+#          stored at its nodes, or -1 if there is a negative cycle
+def bellman_ford_vectorized(G, start, return_array=False, stats=None):
+    nodes, src, dst, weight, indptr = graph_to_arrays(G)
+    dist = bellman_ford_arrays(len(nodes), src, dst, weight, indptr, nodes.index(start), stats)
+    if dist is None:
+        return -1
+    if return_array:
+        return dist
+    # Keep integer costs as integers when every weight is an integer, as bellman_ford does
+    integral = bool(np.all(weight == np.round(weight)))
+    for node, cost in zip(nodes, dist.tolist()):
+        G.nodes[node]['cost'] = int(cost) if integral and cost != math.inf else cost
+    return G
+
+# Queue-based Bellman-Ford (SPFA): only edges out of nodes whose cost just changed are relaxed again.
+# Inputs: A graph with a "weight" on every edge, a start node and an optional stats dict, as in bellman_ford
+# Outputs: dist, the lowest cost to reach each node (inf if unreachable),
+#          pred, the node before each node on its cheapest path (None for the start and unreachable nodes),
+#          and cycle, the list of nodes on a negative cycle in edge order, or None if there is none.
+#          When a cycle is found, dist and pred hold the values reached when it was detected.
+def spfa(G, start, stats=None):
+    dist = {node: math.inf for node in G}
+    pred = {node: None for node in G}
+    # length[v] is the number of edges on the path to v through pred
+    length = {node: 0 for node in G}
+    dist[start] = 0
+    queue = deque([start])
+    in_queue = {start}
+    n = len(G)
+    relaxations = 0
+    if stats is not None:
+        stats["relaxations"] = 0
+
+    while queue:
+        u = queue.popleft()
+        in_queue.discard(u)
+        cost_u = dist[u]
+        if stats is not None:
+            stats["relaxations"] += len(G.adj[u])
+        for v, data in G.adj[u].items():
+            if cost_u + data["weight"] < dist[v]:
+                dist[v] = cost_u + data["weight"]
+                pred[v] = u
+                length[v] = length[u] + 1
+                # A simple path has at most |V| - 1 edges, so a longer one must go around a negative cycle
+                if length[v] >= n:
+                    return dist, pred, pred_cycle(pred, v, n)
+                if v not in in_queue:
+                    queue.append(v)
+                    in_queue.add(v)
+                relaxations += 1
+                # Walking the pred tree costs O(|V|), so doing it once every |V| relaxations
+                # usually finds a cycle long before a path reaches |V| edges, at no extra asymptotic cost
+                if relaxations % n == 0:
+                    node = find_pred_cycle(pred)
+                    if node is not None:
+                        return dist, pred, pred_cycle(pred, node, n)
+
+    return dist, pred, None
+
+
+# Looks for a cycle among the pred pointers, which can only form around a negative cycle
+# Inputs: The pred dict from spfa
+# Outputs: A node on a pred cycle, or None if the pointers form a tree
+def find_pred_cycle(pred):
+    # Each walk stops at a node visited by an earlier walk, so every node is visited once
+    walk_of = {}
+    for walk, node in enumerate(pred):
+        while node is not None and node not in walk_of:
+            walk_of[node] = walk
+            node = pred[node]
+        if node is not None and walk_of[node] == walk:
+            return node
+    return None
+
+
+# Follows pred back from node, which lies on or after a cycle of pred pointers, and returns the cycle
+# Inputs: The pred dict from spfa, the node to start from and the number of nodes in the graph
+# Outputs: The nodes of the cycle, ordered along the direction of the edges
+def pred_cycle(pred, node, n):
+    # After |V| steps back we are certainly on the cycle itself
+    for _ in range(n):
+        node = pred[node]
+    cycle = [node]
+    u = pred[node]
+    while u != node:
+        cycle.append(u)
+        u = pred[u]
+    cycle.reverse()
+    return cycle
+
+# Finds Johnson's potentials by running Bellman-Ford from a virtual node with a 0 weight edge to every node
+# Inputs: The number of nodes and the arrays from graph_to_arrays
+# Outputs: An array h with h[u] + w(u, v) - h[v] >= 0 for every edge, or None if there is a negative cycle
+def johnson_potentials(n, src, dst, weight, indptr):
+    # The virtual node is numbered n, after every real node, so its edges stay sorted by src
+    src = np.concatenate([src, np.full(n, n)])
+    dst = np.concatenate([dst, np.arange(n)])
+    weight = np.concatenate([weight, np.zeros(n)])
+    indptr = np.append(indptr, indptr[-1] + n)
+    dist = bellman_ford_arrays(n + 1, src, dst, weight, indptr, n)
+    return None if dist is None else dist[:n]
+
+
+# The reweighted graph used by dijkstra_task, set once per process by init_johnson_worker
+worker_graph = None
+
+def init_johnson_worker(indptr, indices, weights):
+    global worker_graph
+    # Plain lists index faster than arrays one element at a time
+    worker_graph = (indptr.tolist(), indices.tolist(), weights.tolist())
+
+
+# Dijkstra with a binary heap over the graph held by this process
+# Inputs: The position of the source node
+# Outputs: The source position and an array of the lowest reweighted cost to every node
+def dijkstra_task(source):
+    indptr, indices, weights = worker_graph
+    dist = [math.inf] * (len(indptr) - 1)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        cost_u, u = heappop(heap)
+        if cost_u > dist[u]:
+            continue
+        for i in range(indptr[u], indptr[u + 1]):
+            cost_v = cost_u + weights[i]
+            if cost_v < dist[indices[i]]:
+                dist[indices[i]] = cost_v
+                heappush(heap, (cost_v, indices[i]))
+    return source, np.array(dist)
+
+
+# Johnson's algorithm: one Bellman-Ford pass makes every edge weight non-negative, then Dijkstra runs from each source.
+# Inputs: A graph with a "weight" on every edge, the sources to find costs from (all nodes by default),
+#         and the number of worker processes to run Dijkstra in (None runs in this process)
+# Outputs: Yields (source, row) for each source in order, where row is an array of the lowest cost
+#          from the source to each node in the order of G.nodes (inf if unreachable).
+#          Raises NetworkXUnbounded if the graph has a negative cycle
+def johnson_rows(G, sources=None, workers=None):
+    nodes, src, dst, weight, indptr = graph_to_arrays(G)
+    potential = johnson_potentials(len(nodes), src, dst, weight, indptr)
+    if potential is None:
+        raise nx.NetworkXUnbounded("Negative cycle detected.")
+    # Rounding can leave tiny negative weights when the weights are floats
+    reweighted = np.maximum(weight + potential[src] - potential[dst], 0)
+    index = {node: i for i, node in enumerate(nodes)}
+    sources = list(G) if sources is None else list(sources)
+    positions = [index[source] for source in sources]
+
+    if workers is None or workers <= 1:
+        init_johnson_worker(indptr, dst, reweighted)
+        rows = map(dijkstra_task, positions)
+        for source, (s, row) in zip(sources, rows):
+            yield source, row - potential[s] + potential
+        return
+
+    # The graph goes to each worker once through the initializer, and only source positions and rows cross per task
+    chunksize = max(1, len(positions) // (4 * workers))
+    with ProcessPoolExecutor(workers, initializer=init_johnson_worker, initargs=(indptr, dst, reweighted)) as pool:
+        for source, (s, row) in zip(sources, pool.map(dijkstra_task, positions, chunksize=chunksize)):
+            yield source, row - potential[s] + potential
+
+
+# Collects the rows from johnson_rows into one matrix.
+# Inputs: The same as johnson_rows, plus an optional path. When a path is given the matrix is a
+#         memory-mapped .npy file there, so it can be larger than memory and reopened with np.load
+# Outputs: A matrix with a row for each source and a column for each node in the order of G.nodes
+def johnson_all_pairs(G, sources=None, workers=None, path=None):
+    sources = list(G) if sources is None else list(sources)
+    shape = (len(sources), len(G))
+    if path is None:
+        matrix = np.empty(shape)
+    else:
+        matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=shape)
+    for i, (source, row) in enumerate(johnson_rows(G, sources, workers)):
+        matrix[i] = row
+    if path is not None:
+        matrix.flush()
+    return matrix
+
+# Keeps the lowest costs from a start node up to date as edges of the graph change,
+# repairing only the part of the shortest path tree that a batch of changes affects.
+# Inputs: A graph with a "weight" on every edge and a start node. The graph is changed in place by update
+# Attributes: dist and pred, as returned by spfa, and cycle, the negative cycle found by the
+#             last update or None. While there is a cycle, dist and pred are not meaningful
+class DynamicShortestPaths:
+    def __init__(self, G, start):
+        self.G = G
+        self.start = start
+        self.recompute()
+
+    # Runs spfa from scratch and rebuilds the children of each node in the tree
+    def recompute(self):
+        self.dist, self.pred, self.cycle = spfa(self.G, self.start)
+        self.children = {node: set() for node in self.G}
+        for node, parent in self.pred.items():
+            if parent is not None:
+                self.children[parent].add(node)
+        self.touched = len(self.G)
+
+    # Applies a batch of edge changes and repairs the costs
+    # Inputs: An iterable of (u, v, weight) triples. A weight of None deletes the edge (u, v),
+    #         anything else inserts the edge or changes its weight
+    # Outputs: The nodes on a negative cycle reachable from the start, or None if there is none
+    def update(self, changes):
+        invalid_roots = []
+        lowered = []
+        for u, v, weight in changes:
+            for node in (u, v):
+                if node not in self.dist:
+                    self.dist[node], self.pred[node], self.children[node] = math.inf, None, set()
+            old = self.G[u][v]["weight"] if self.G.has_edge(u, v) else math.inf
+            if weight is None:
+                self.G.remove_edge(u, v)
+                weight = math.inf
+            else:
+                self.G.add_edge(u, v, weight=weight)
+            # A tree edge that got worse may no longer give the lowest cost below it,
+            # while an edge that got better can only lower costs below its head
+            if weight > old and self.pred[v] == u:
+                invalid_roots.append(v)
+            elif weight < old:
+                lowered.append((u, v))
+
+        # Costs are only defined again once the cycle is gone, so there is nothing to repair from
+        if self.cycle is not None:
+            self.recompute()
+            return self.cycle
+
+        # Forget the costs of every node below a tree edge that got worse
+        invalid = set()
+        stack = [v for v in invalid_roots if v != self.start]
+        while stack:
+            node = stack.pop()
+            if node in invalid:
+                continue
+            invalid.add(node)
+            if self.pred[node] is not None:
+                self.children[self.pred[node]].discard(node)
+            self.dist[node], self.pred[node] = math.inf, None
+            stack.extend(self.children[node])
+            self.children[node] = set()
+
+        # Seed the queue with the best edge into each forgotten node from the rest of the tree,
+        # and with the heads of edges that got better
+        queue = deque()
+        in_queue = set()
+        for node in invalid:
+            for u, data in self.G.pred[node].items():
+                if u not in invalid and self.dist[u] + data["weight"] < self.dist[node]:
+                    self.set_pred(node, u, self.dist[u] + data["weight"])
+            if self.dist[node] < math.inf:
+                queue.append(node)
+                in_queue.add(node)
+        for u, v in lowered:
+            if self.G.has_edge(u, v) and self.dist[u] + self.G[u][v]["weight"] < self.dist[v]:
+                self.set_pred(v, u, self.dist[u] + self.G[u][v]["weight"])
+                if v not in in_queue:
+                    queue.append(v)
+                    in_queue.add(v)
+
+        # Propagate the new costs the same way spfa does, from the seeded nodes only
+        n = len(self.G)
+        touched = set(invalid)
+        relaxations = 0
+        while queue:
+            u = queue.popleft()
+            in_queue.discard(u)
+            touched.add(u)
+            cost_u = self.dist[u]
+            for v, data in self.G.adj[u].items():
+                if cost_u + data["weight"] < self.dist[v]:
+                    self.set_pred(v, u, cost_u + data["weight"])
+                    if v not in in_queue:
+                        queue.append(v)
+                        in_queue.add(v)
+                    relaxations += 1
+                    if relaxations % n == 0:
+                        node = find_pred_cycle(self.pred)
+                        if node is not None:
+                            self.cycle = pred_cycle(self.pred, node, n)
+                            self.touched = len(touched)
+                            return self.cycle
+
+        self.touched = len(touched)
+        return None
+
+    # Moves node under a new parent in the tree with the given cost
+    def set_pred(self, node, parent, cost):
+        if self.pred[node] is not None:
+            self.children[self.pred[node]].discard(node)
+        self.pred[node] = parent
+        self.children[parent].add(node)
+        self.dist[node] = cost
+
 # Function that generates input for our algorithm.
 # Inputs: Takes the num_nodse and a float between 0 and 1 specifying how sparse the graph should be.
 # Outputs: Produces a random graph with num_nodes nodes and random edge weights
@@ -55,6 +440,9 @@ def make_input(num_nodes, p):
 # Function for visualizing the output of our code relative to the nx code.
 # Takes as input the number of nodes in the graph to be generated and the sparsity of the graph
 def draw_example(num_nodes, p):
+    # Imported here so the rest of the module runs without a display or matplotlib installed
+    import matplotlib.pyplot as plt
+
     # Initialize graph
     G, start = make_input(num_nodes, p)
 
@@ -117,13 +505,14 @@ def draw_example(num_nodes, p):
 # Runs a single test
 # Inputs: num_nodes, number of nodes for input graph
 #         p, float between 0 and 1 influencing how sparse the graph will be
+#         engine, the implementation to test (bellman_ford or bellman_ford_vectorized)
 # Outputs: Boolean value indicating whether or not our output matches networkx
-def do_test(num_nodes, p):
+def do_test(num_nodes, p, engine=bellman_ford):
     G, start = make_input(num_nodes, p)
 
     try:
         nx_output = nx.single_source_bellman_ford(G, start)
-        G = bellman_ford(G, start)    
+        G = engine(G, start)    
         our_output = G.nodes(data=True)
 
         for n in nx_output[0]:
@@ -131,28 +520,209 @@ def do_test(num_nodes, p):
                 return False
         return True
     except nx.exception.NetworkXUnbounded:
-        return bellman_ford(G, start) == -1
+        return engine(G, start) == -1
 
 # Takes as input the size of graph to test on, a list of sparsity values,
 # and the number of tests to run for each sparsity value, and prints the
 # result of running those tests
-def test_helper(node_count, ps, num_tests):
+def test_helper(node_count, ps, num_tests, engine=bellman_ford):
     passed = 0
 
     for p in ps:
         for _ in range (num_tests):
-            passed += do_test(node_count, p)
+            passed += do_test(node_count, p, engine)
 
     print(f"{passed} / {num_tests*len(ps)} tests pass for graphs with {node_count} nodes.")
 
 # Function to run a variety of tests on nodes of varying sparsity and size
-def tests():
-    test_helper(10, [0.05, 0.3, 0.8], 100)
-    test_helper(100, [0.05, 0.3, 0.8], 50)
-    test_helper(1000, [0.02, 0.1], 5)
-    test_helper(10000, [0.0001], 1)
+def tests(engine=bellman_ford):
+    test_helper(10, [0.05, 0.3, 0.8], 100, engine)
+    test_helper(100, [0.05, 0.3, 0.8], 50, engine)
+    test_helper(1000, [0.02, 0.1], 5, engine)
+    test_helper(10000, [0.0001], 1, engine)
+
+# Runs a single test of spfa
+# Inputs: num_nodes, number of nodes for input graph
+#         p, float between 0 and 1 influencing how sparse the graph will be
+# Outputs: Boolean value indicating whether the costs match networkx, or
+#          if there is a negative cycle, whether the returned cycle is one
+def do_spfa_test(num_nodes, p):
+    G, start = make_input(num_nodes, p)
+    dist, pred, cycle = spfa(G, start)
+
+    try:
+        nx_output = nx.single_source_bellman_ford(G, start)
+    except nx.exception.NetworkXUnbounded:
+        if cycle is None:
+            return False
+        edges = list(zip(cycle, cycle[1:] + cycle[:1]))
+        return all(G.has_edge(u, v) for u, v in edges) and sum(G[u][v]["weight"] for u, v in edges) < 0
+
+    if cycle is not None:
+        return False
+    for n in G:
+        if nx_output[0].get(n, math.inf) != dist[n]:
+            return False
+        # Each node's pred edge must be tight, so following pred gives a cheapest path
+        if pred[n] is not None and dist[pred[n]] + G[pred[n]][n]["weight"] != dist[n]:
+            return False
+    return True
+
+# Function to run spfa on graphs of varying sparsity and size and print how many tests pass
+def spfa_tests():
+    for node_count, ps, num_tests in [(10, [0.05, 0.3, 0.8], 100), (100, [0.05, 0.3, 0.8], 50),
+                                      (1000, [0.02, 0.1], 5), (10000, [0.0001], 1)]:
+        passed = sum(do_spfa_test(node_count, p) for p in ps for _ in range(num_tests))
+        print(f"{passed} / {num_tests*len(ps)} spfa tests pass for graphs with {node_count} nodes.")
+
+# Checks johnson_all_pairs against networkx on a random graph
+# Inputs: num_nodes, p as in do_test, and the number of worker processes to use
+# Outputs: Boolean value indicating whether every cost matches, or whether both find a negative cycle
+def do_johnson_test(num_nodes, p, workers=None):
+    G, start = make_input(num_nodes, p)
+    try:
+        nx_output = dict(nx.all_pairs_bellman_ford_path_length(G))
+    except nx.exception.NetworkXUnbounded:
+        try:
+            johnson_all_pairs(G, workers=workers)
+        except nx.exception.NetworkXUnbounded:
+            return True
+        return False
+
+    matrix = johnson_all_pairs(G, workers=workers)
+    nodes = list(G)
+    for i, u in enumerate(nodes):
+        for j, v in enumerate(nodes):
+            if nx_output[u].get(v, math.inf) != matrix[i, j]:
+                return False
+    return True
+
+# Checks DynamicShortestPaths against a full spfa run after every batch of random edge changes
+# Inputs: num_nodes, p as in do_test, the number of batches and the number of changes in each
+# Outputs: Boolean value indicating whether the costs, or the presence of a negative cycle, always match
+def do_dynamic_test(num_nodes, p, batches=20, batch_size=10):
+    G, start = make_input(num_nodes, p)
+    dynamic = DynamicShortestPaths(G, start)
+
+    for _ in range(batches):
+        changes = []
+        for _ in range(batch_size):
+            kind = random.random()
+            if kind < 0.3 and G.number_of_edges() > 0:
+                u, v = random.choice(list(G.edges))
+                changes.append((u, v, None))
+            elif kind < 0.6 and G.number_of_edges() > 0:
+                u, v = random.choice(list(G.edges))
+                changes.append((u, v, random.randrange(-5, 5)))
+            else:
+                u, v = random.sample(range(num_nodes), 2)
+                changes.append((u, v, random.randrange(-1, 10)))
+        # Later changes to the same edge win, the same as applying them one at a time
+        if len({(u, v) for u, v, w in changes}) < len(changes):
+            continue
+
+        cycle = dynamic.update(changes)
+        dist, pred, full_cycle = spfa(G, start)
+        if (cycle is None) != (full_cycle is None):
+            return False
+        if cycle is not None:
+            edges = list(zip(cycle, cycle[1:] + cycle[:1]))
+            if not all(G.has_edge(u, v) for u, v in edges) or sum(G[u][v]["weight"] for u, v in edges) >= 0:
+                return False
+        elif dist != dynamic.dist:
+            return False
+    return True
+
+# Runs networkx's Bellman-Ford with the same outputs as bellman_ford, for comparing against in benchmark
+def nx_bellman_ford(G, start, stats=None):
+    try:
+        nx.single_source_bellman_ford(G, start)
+    except nx.exception.NetworkXUnbounded:
+        return -1
+    return G
+
+# The engines benchmark times by default. Each takes (G, start, stats) and fills stats["relaxations"]
+# when it counts them, and returns -1 or a cycle if it finds a negative cycle
+BENCHMARK_ENGINES = {
+    "bellman_ford": bellman_ford,
+    "bellman_ford_vectorized": lambda G, start, stats: bellman_ford_vectorized(G, start, True, stats),
+    "spfa": lambda G, start, stats: -1 if spfa(G, start, stats)[2] is not None else G,
+    "networkx": nx_bellman_ford,
+}
+
+# Times each engine over a sweep of random graphs from make_input and writes the results as JSON.
+# Inputs: node_counts and ps, the graph sizes and edge probabilities to sweep,
+#         engines, a dict of name to engine (BENCHMARK_ENGINES by default),
+#         repeats, the number of graphs timed at each size and probability,
+#         time_limit, the seconds after which an engine is left out of larger sizes,
+#         and path, the file the JSON is written to (None to skip writing it)
+# Outputs: A list with one record per engine, size and probability, holding the median time in seconds,
+#          the relaxations counted on the first graph, the peak memory traced on the first graph
+#          and how many of the graphs had a negative cycle
+def benchmark(node_counts=(100, 300, 1000, 3000), ps=(0.001, 0.005, 0.02), engines=None,
+              repeats=3, time_limit=10, path="bellman_ford_benchmark.json"):
+    engines = BENCHMARK_ENGINES if engines is None else engines
+    too_slow = set()
+    records = []
+
+    for num_nodes in node_counts:
+        for p in ps:
+            graphs = [make_input(num_nodes, p) for _ in range(repeats)]
+            for name, engine in engines.items():
+                if name in too_slow:
+                    continue
+                times, cycles = [], 0
+                for G, start in graphs:
+                    begin = perf_counter()
+                    result = engine(G, start, None)
+                    times.append(perf_counter() - begin)
+                    cycles += isinstance(result, int) and result == -1
+
+                # Memory is traced in a separate run since tracemalloc slows down every allocation
+                stats = {}
+                G, start = graphs[0]
+                tracemalloc.start()
+                engine(G, start, stats)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                records.append({
+                    "engine": name,
+                    "nodes": num_nodes,
+                    "p": p,
+                    "edges": G.number_of_edges(),
+                    "seconds": float(np.median(times)),
+                    "relaxations": stats.get("relaxations"),
+                    "peak_bytes": peak,
+                    "negative_cycles": cycles,
+                    "graphs": repeats,
+                })
+                if max(times) > time_limit:
+                    too_slow.add(name)
+
+    if path is not None:
+        with open(path, "w") as f:
+            json.dump(records, f, indent=2)
+    return records
+
+
+if __name__ == "__main__":
+    draw_example(10,0.1)
+
+    # tests()
+    # tests(bellman_ford_vectorized)
+    # spfa_tests()
+
+    # Times every engine against networkx on growing graphs and writes bellman_ford_benchmark.json
+    # for record in benchmark():
+    #     print(record["engine"], record["nodes"], record["p"], f"{record['seconds']:.4f}s", record["relaxations"])
 
+    # Checks the incremental repairs of DynamicShortestPaths against full recomputation
+    # print(sum(do_dynamic_test(50, p) for p in [0.02, 0.05, 0.1] for _ in range(10)), "/ 30")
 
-draw_example(10,0.1)
+    # Checks Johnson's all-pairs costs against networkx, running Dijkstra in 4 processes
+    # print(sum(do_johnson_test(100, p, workers=4) for p in [0.01, 0.03, 0.1] for _ in range(10)), "/ 30")
 
-# tests()
\ No newline at end of file
+    # Streams all-pairs costs on a larger graph into a memory-mapped matrix
+    # G, start = make_input(2000, 0.0005)
+    # johnson_all_pairs(G, workers=4, path="distances.npy")
\ No newline at end of file
@@ -1,51 +1,147 @@
 import random
+from itertools import repeat
+from time import perf_counter
+from multiprocessing import Value
+from concurrent.futures import ProcessPoolExecutor
+import math
 import networkx as nx
 import matplotlib.pyplot as plt
 import scipy
+import numpy as np
 
-def Ramsey(G, sG):
-    # O(1)
-    if len(sG) == 0:
-        return (nx.Graph(), nx.Graph())
-    
-    # O(1)
-    v = sG.pop()
-    adj = G.adj[v]
-
-    # Neighbors
-    # O(n)
-    N = sG.copy()
-    # Non-Neighbors
-    # O(n)
-    NC = sG.copy()
-
-    # Iterate through the nodes in the subgraph, if they are adjacent to v remove them from
-    # the non-neighbor set, and vice versa for the neighbor set.
-    for u in sG:
-        if u in adj:
-            NC.remove(u)
-        else:
-            N.remove(u)
-            
-    # Recursive calls
-    C1, I1 = Ramsey(G, N)
-    C2, I2 = Ramsey(G, NC)
-
-    # All O(1)
-    if len(C1.nodes) + 1 > len(C2.nodes):
-        C = C1
-        C.add_node(v)
-    else:
-        C = C2
+# Builds a bitmask of neighbors for each node, where bit i stands for nodes[i]
+# O(n^2 / 8) memory
+def adjacency_masks(G, nodes):
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    masks = []
+    # Neighbors outside of nodes all land on the extra last entry, which is left out of the mask
+    row = np.zeros(n + 1, dtype=bool)
+    for v in nodes:
+        positions = np.fromiter(map(index.get, G.adj[v], repeat(n)), dtype=np.int64, count=len(G.adj[v]))
+        row[positions] = True
+        masks.append(int.from_bytes(np.packbits(row[:n], bitorder="little").tobytes(), "little"))
+        row[positions] = False
+    return masks
 
-    if I2.number_of_nodes() + 1 > I1.number_of_nodes():
-        I = I2
-        I.add_node(v)
-    else:
-        I = I1
+# Ramsey on bitmasks, with an explicit stack in place of recursion
+# Takes the neighbor masks and the mask of nodes to search, returns the masks of C and I
+def ramsey_masks(adj, S):
+    # Each entry is either a mask still to split, or the pivot of a split whose two halves are done
+    stack = [S]
+    results = []
+    while stack:
+        item = stack.pop()
+        if type(item) is tuple:
+            # O(1) besides the big int or
+            v = item[0]
+            C2, c2, I2, i2 = results.pop()
+            C1, c1, I1, i1 = results.pop()
+            if c1 + 1 > c2:
+                C, c = C1 | (1 << v), c1 + 1
+            else:
+                C, c = C2, c2
+            if i2 + 1 > i1:
+                I, i = I2 | (1 << v), i2 + 1
+            else:
+                I, i = I1, i1
+            results.append((C, c, I, i))
+            continue
+
+        if item == 0:
+            results.append((0, 0, 0, 0))
+            continue
 
+        # The lowest bit is the pivot, in place of sG.pop()
+        # O(n / 64) per big int operation
+        low = item & -item
+        v = low.bit_length() - 1
+        rest = item ^ low
+        # Neighbors and non-neighbors
+        N = rest & adj[v]
+        NC = rest & ~adj[v]
+
+        # N is split first, so its result is under NC's when the pivot is combined
+        stack.append((v,))
+        stack.append(NC)
+        stack.append(N)
+
+    C, c, I, i = results.pop()
     return C, I
 
+# Turns a bitmask back into the set of nodes it stands for
+def mask_nodes(mask, nodes):
+    found = set()
+    while mask:
+        low = mask & -mask
+        found.add(nodes[low.bit_length() - 1])
+        mask ^= low
+    return found
+
+# Ramsey on Python sets, for graphs too sparse for bitmasks to pay off
+# Takes any adjacency that supports "in" per node, such as G.adj, and a set of nodes to search,
+# returns the sets C and I. Only sets of nodes are made, so memory stays O(n) on top of the graph
+def ramsey_sets(adj, S):
+    stack = [set(S)]
+    results = []
+    while stack:
+        item = stack.pop()
+        if type(item) is tuple:
+            v = item[0]
+            C2, I2 = results.pop()
+            C1, I1 = results.pop()
+            if len(C1) + 1 > len(C2):
+                C = C1
+                C.add(v)
+            else:
+                C = C2
+            if len(I2) + 1 > len(I1):
+                I = I2
+                I.add(v)
+            else:
+                I = I1
+            results.append((C, I))
+            continue
+
+        if len(item) == 0:
+            results.append((set(), set()))
+            continue
+
+        v = item.pop()
+        nbrs = adj[v]
+        # O(min(|S|, deg(v))) for N, O(|S|) for NC
+        if len(item) < len(nbrs):
+            N = {u for u in item if u in nbrs}
+        else:
+            N = item.intersection(nbrs)
+        NC = item - N
+
+        stack.append((v,))
+        stack.append(NC)
+        stack.append(N)
+
+    return results.pop()
+
+# Picks "bitset" when the masks take no more memory than about 8 bytes per neighbor, and "sets" otherwise
+def choose_method(G, sG):
+    degrees = sum(len(G.adj[v]) for v in sG)
+    return "bitset" if len(sG) * len(sG) / 8 <= 8 * degrees else "sets"
+
+# Finds a clique C and an independent set I in the subgraph of G on the nodes in sG.
+# method is "bitset", "sets" or "auto", which uses choose_method.
+# Pivots are taken in the order of sG for bitsets and in sG.pop() order for sets.
+# Returns C and I as sets of nodes
+def Ramsey(G, sG, method="auto"):
+    if method == "auto":
+        method = choose_method(G, sG)
+    if method == "sets":
+        return ramsey_sets(G.adj, sG)
+
+    nodes = list(sG)
+    adj = adjacency_masks(G, nodes)
+    C, I = ramsey_masks(adj, (1 << len(nodes)) - 1)
+    return mask_nodes(C, nodes), mask_nodes(I, nodes)
+
 
 
 
@@ -53,24 +149,425 @@ def Ramsey(G, sG):
 
 
 
-# SEND A COPY OF G AS THE ARGUMENT
-def clique_removal(G):
-    Cs, Is = [], []
-    C, I = Ramsey(G,set(G))
-    Cs.append(C)
-    Is.append(I)
-    while G.number_of_nodes() != 0:
-        G.remove_nodes_from(C.nodes)
-        C, I = Ramsey(G,set(G))
-        Cs.append(C)
-        Is.append(I)
-    return max(Is, key=lambda x: x.number_of_nodes())
+# Runs the rounds of clique removal without changing G, yielding (C, I) for each round.
+# Each round runs Ramsey on the nodes still alive and then removes C, until no nodes are left.
+# The neighbor masks are built once and the alive nodes are a mask (or a set for method="sets"),
+# so a round costs one pass of ramsey_masks, and stopping early skips the rest.
+# With complement=True this runs on the complement of G without building it.
+# A clique in the complement is an independent set in G and the other way around,
+# and Ramsey on the complement finds exactly the sets Ramsey on G does with C and I swapped,
+# so each round yields (I, C) and removes I
+def clique_removal_rounds(G, complement=False, method="auto"):
+    if method == "auto":
+        method = choose_method(G, G)
+
+    if method == "sets":
+        alive = set(G)
+        while alive:
+            C, I = ramsey_sets(G.adj, alive)
+            if complement:
+                C, I = I, C
+            alive -= C
+            yield C, I
+        return
+
+    nodes = list(G)
+    adj = adjacency_masks(G, nodes)
+    for C, I, alive in removal_rounds_masks(adj, (1 << len(nodes)) - 1, complement):
+        yield mask_nodes(C, nodes), mask_nodes(I, nodes)
+
+# The rounds of clique_removal_rounds on masks, yielding the masks of C and I and of the nodes left alive after each round
+def removal_rounds_masks(adj, alive, complement=False):
+    while alive:
+        C, I = ramsey_masks(adj, alive)
+        if complement:
+            C, I = I, C
+        alive &= ~C
+        yield C, I, alive
+
+# Returns the largest independent set found over all rounds as a graph with no edges.
+# G is left as it is, and only the best set so far is kept
+def clique_removal(G, complement=False, method="auto"):
+    best = set()
+    for C, I in clique_removal_rounds(G, complement, method):
+        if len(I) > len(best):
+            best = I
+    I = nx.Graph()
+    I.add_nodes_from(best)
+    return I
 
 def max_clique(G):
-    G = nx.complement(G)
-    max_clique = clique_removal(G)
+    # Memory stays proportional to G, where nx.complement(G) would have about n^2 / 2 edges on a sparse graph
+    max_clique = clique_removal(G, complement=True)
     return set(max_clique.nodes)
 
+# Greedy coloring of the nodes in P, in the bitset style of BBMC.
+# Returns the nodes and their colors in order of increasing color, leaving out nodes with a color below k_min,
+# since a clique using only those cannot beat the best one found
+def color_sort(adj, P, k_min):
+    order, colors = [], []
+    k = 0
+    while P:
+        k += 1
+        # Q is the nodes that can still take color k
+        Q = P
+        while Q:
+            low = Q & -Q
+            v = low.bit_length() - 1
+            Q &= ~adj[v]
+            Q ^= low
+            P ^= low
+            if k >= k_min:
+                order.append(v)
+                colors.append(k)
+    return order, colors
+
+# Exact maximum clique by branch and bound with greedy coloring bounds, starting from the clique found by max_clique.
+# Stops early once time_limit seconds or node_limit expanded nodes are used up.
+# Returns the best clique found as a set, an upper bound on the size of any clique in G
+# (the same as the size of the clique when the search finished), and a dict of solver statistics
+def exact_max_clique(G, time_limit=None, node_limit=None):
+    start = perf_counter()
+    best = max_clique(G)
+    stats = {"initial": len(best), "nodes": 0, "prunes": 0, "time_to_best": perf_counter() - start}
+
+    # Branching on high degree nodes last, at the low bits, keeps the colorings small
+    nodes = sorted(G, key=lambda v: len(G.adj[v]), reverse=True)
+    # A self-loop would leave v in its own mask, so color_sort would never clear it and v would be its own candidate
+    adj = [mask & ~(1 << v) for v, mask in enumerate(adjacency_masks(G, nodes))]
+    best_size = len(best)
+    best_found = None
+
+    # Each frame is a clique R, the candidates P that extend it, and the colored candidates still to branch on,
+    # which are taken from the end, highest color first
+    P = (1 << len(nodes)) - 1
+    order, colors = color_sort(adj, P, best_size + 1)
+    stats["prunes"] += P.bit_count() - len(order)
+    stack = [[[], P, order, colors]]
+    stopped = False
+    while stack:
+        R, P, order, colors = stack[-1]
+        # The coloring bounds any clique in P by its number of colors, so every candidate left is pruned
+        if not order or len(R) + colors[-1] <= best_size:
+            stats["prunes"] += len(order)
+            stack.pop()
+            continue
+
+        if (time_limit is not None and perf_counter() - start > time_limit) or \
+           (node_limit is not None and stats["nodes"] >= node_limit):
+            stopped = True
+            break
+
+        v = order.pop()
+        colors.pop()
+        stats["nodes"] += 1
+        new_P = P & adj[v]
+        stack[-1][1] = P & ~(1 << v)
+        if new_P == 0:
+            if len(R) + 1 > best_size:
+                best_found, best_size = R + [v], len(R) + 1
+                stats["time_to_best"] = perf_counter() - start
+        else:
+            order, colors = color_sort(adj, new_P, best_size - len(R))
+            stats["prunes"] += new_P.bit_count() - len(order)
+            stack.append([R + [v], new_P, order, colors])
+
+    if best_found is not None:
+        best = {nodes[v] for v in best_found}
+    upper_bound = best_size
+    if stopped:
+        # Every candidate left on the stack is bounded by its frame's clique plus its color
+        upper_bound = max([best_size] + [len(R) + colors[-1] for R, P, order, colors in stack if order])
+    stats["seconds"] = perf_counter() - start
+    stats["complete"] = not stopped
+    return best, upper_bound, stats
+
+# Builds the CSR arrays of G, so the neighbors of nodes[u] are at indices[indptr[u]:indptr[u + 1]].
+# Self-loops are left out, since a node is never its own neighbor in a clique or a coloring
+def graph_csr(G, nodes):
+    index = {node: i for i, node in enumerate(nodes)}
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(G.adj[v]) - (v in G.adj[v]) for v in nodes])
+    indices = np.fromiter((index[u] for v in nodes for u in G.adj[v] if u != v), dtype=np.int64, count=indptr[-1])
+    return indptr, indices
+
+# Builds neighbor masks from CSR arrays, where the node at index u gets bit rank[u]
+# Returns the masks listed by rank
+def rank_masks(indptr, indices, rank):
+    n = len(rank)
+    masks = [0] * n
+    row = np.zeros(n, dtype=bool)
+    for u in range(n):
+        positions = rank[indices[indptr[u]:indptr[u + 1]]]
+        row[positions] = True
+        masks[rank[u]] = int.from_bytes(np.packbits(row, bitorder="little").tobytes(), "little")
+        row[positions] = False
+    return masks
+
+# The graph and shared best size used by portfolio_task, set once per process by init_portfolio_worker
+worker_graph = None
+
+def init_portfolio_worker(indptr, indices, cores, best_size):
+    global worker_graph
+    worker_graph = (indptr, indices, cores, best_size)
+
+# Runs clique removal restarts from different node orders until the deadline or max_restarts.
+# Takes a SeedSequence, the number of seconds to run, the restart cap and the target ("clique" or "independent").
+# Returns the node indices of the best set found and the number of restarts run
+def portfolio_task(seed, seconds, max_restarts, target):
+    indptr, indices, cores, best_size = worker_graph
+    deadline = perf_counter() + seconds
+    rng = np.random.default_rng(seed)
+    n = len(indptr) - 1
+    degrees = np.diff(indptr)
+    kinds = ["random", "degree", "degeneracy"]
+    best, restarts = [], 0
+
+    while restarts < max_restarts and perf_counter() < deadline:
+        kind = kinds[restarts % 3]
+        ties = rng.random(n)
+        if kind == "random":
+            order = rng.permutation(n)
+        else:
+            key = degrees if kind == "degree" else cores
+            # The first nodes are the first pivots, so a clique starts from well connected nodes
+            # and an independent set from poorly connected ones. Ties are broken at random
+            order = np.lexsort((ties, -key if target == "clique" else key))
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(n)
+        adj = rank_masks(indptr, indices, rank)
+
+        for C, I, alive in removal_rounds_masks(adj, (1 << n) - 1, target == "clique"):
+            if I.bit_count() > len(best):
+                best = order[list(mask_nodes(I, range(n)))].tolist()
+                with best_size.get_lock():
+                    best_size.value = max(best_size.value, len(best))
+            # No later round can find a set larger than the nodes still alive
+            if alive.bit_count() <= best_size.value or perf_counter() >= deadline:
+                break
+        restarts += 1
+
+    return best, restarts
+
+# Runs restarts of clique removal from random, degree and degeneracy orders across worker processes
+# and returns the largest clique (or independent set, with target="independent") found within time_limit seconds.
+# workers=None runs in this process. The best size so far is shared between workers, so a restart
+# stops as soon as too few nodes are left for it to do better.
+# Returns the best set and a dict with its size, the restarts run and the seconds taken
+def ramsey_portfolio(G, target="clique", time_limit=10, workers=None, restarts=None, seed=None):
+    start = perf_counter()
+    nodes = list(G)
+    indptr, indices = graph_csr(G, nodes)
+    # core_number rejects self-loops, so the cores come from a copy without them
+    H = G.copy()
+    H.remove_edges_from(nx.selfloop_edges(H))
+    core = nx.core_number(H)
+    cores = np.array([core[v] for v in nodes])
+    best_size = Value("i", 0)
+
+    tasks = 1 if workers is None else workers
+    seeds = np.random.SeedSequence(seed).spawn(tasks)
+    max_restarts = [math.inf] * tasks if restarts is None else [restarts // tasks + (i < restarts % tasks) for i in range(tasks)]
+    args = (seeds, [time_limit] * tasks, max_restarts, [target] * tasks)
+
+    if workers is None:
+        init_portfolio_worker(indptr, indices, cores, best_size)
+        results = list(map(portfolio_task, *args))
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_portfolio_worker, initargs=(indptr, indices, cores, best_size)) as pool:
+            results = list(pool.map(portfolio_task, *args))
+
+    best = max((found for found, count in results), key=len)
+    stats = {"size": len(best), "restarts": sum(count for found, count in results), "seconds": perf_counter() - start}
+    return {nodes[i] for i in best}, stats
+
+# Compares the clique found by one serial run of max_clique with the portfolio run serially and across workers
+# for the same number of seconds, on a random graph
+def benchmark_portfolio(n=1000, p=0.5, time_limit=10, workers=4):
+    G = nx.fast_gnp_random_graph(n, p)
+    start = perf_counter()
+    C = max_clique(G)
+    print(f"single run: clique of {len(C)} in {perf_counter() - start:.2f}s")
+    for w in [None, workers]:
+        C, stats = ramsey_portfolio(G, time_limit=time_limit, workers=w)
+        print(f"portfolio with {w or 1} worker(s): clique of {stats['size']} from {stats['restarts']} restarts in {stats['seconds']:.2f}s")
+
+# Tries to recolor node v with a color other than its own, keeping the coloring proper.
+# If every color is taken by a neighbor, swaps a Kempe chain of two colors d and e so that
+# v's d colored neighbors become e and v can take d. colors is a list and is changed in place
+# Returns whether v was recolored
+def kempe_move(neighbors, colors, v, k):
+    c = colors[v]
+    used = {colors[u] for u in neighbors[v]}
+    for d in range(k):
+        if d != c and d not in used:
+            colors[v] = d
+            return True
+
+    for d in range(k):
+        if d == c:
+            continue
+        for e in range(k):
+            if e == c or e == d:
+                continue
+            # Grow the chain of d and e colored nodes from v's d colored neighbors,
+            # giving up as soon as it reaches an e colored neighbor of v
+            blocked = {u for u in neighbors[v] if colors[u] == e}
+            chain = {u for u in neighbors[v] if colors[u] == d}
+            stack = list(chain)
+            while stack and not (chain & blocked):
+                x = stack.pop()
+                for y in neighbors[x]:
+                    if y not in chain and (colors[y] == d or colors[y] == e):
+                        chain.add(y)
+                        stack.append(y)
+            if chain & blocked:
+                continue
+            for x in chain:
+                colors[x] = e if colors[x] == d else d
+            colors[v] = d
+            return True
+    return False
+
+# Empties the smallest color class with Kempe chain moves for as long as that works,
+# then renumbers the colors so they are 0, 1, ... again
+def kempe_reduce(neighbors, colors):
+    colors = colors.tolist()
+    while colors:
+        k = max(colors) + 1
+        sizes = [0] * k
+        for c in colors:
+            sizes[c] += 1
+        c = sizes.index(min(sizes))
+        if not all(kempe_move(neighbors, colors, v, k) for v in range(len(colors)) if colors[v] == c):
+            break
+        # Give the last color's nodes the color that was emptied
+        colors = [c if x == k - 1 else x for x in colors]
+    return np.array(colors, dtype=np.int64)
+
+# Tabucol: looks for a proper coloring with k colors, starting from colors with the colors k and above
+# moved to their least conflicting color. gamma[v, c] counts v's neighbors with color c, and each step
+# makes the best non-tabu move of a conflicting node, where a move back is tabu for a while after it is made
+# Returns the coloring, or None if it still has conflicts after the given iterations or at the deadline
+def tabucol(indptr, indices, colors, k, iterations, rng, deadline=None):
+    n = len(colors)
+    colors = colors.copy()
+    rows = np.arange(n)
+    gamma = np.zeros((n, k), dtype=np.int64)
+    src = np.repeat(rows, np.diff(indptr))
+    keep = colors[indices] < k
+    np.add.at(gamma, (src[keep], colors[indices][keep]), 1)
+    for v in np.flatnonzero(colors >= k):
+        colors[v] = int(np.argmin(gamma[v]))
+        gamma[indices[indptr[v]:indptr[v + 1]], colors[v]] += 1
+
+    conflicts = int(gamma[rows, colors].sum()) // 2
+    best = conflicts
+    tabu = np.zeros((n, k), dtype=np.int64)
+    for it in range(iterations):
+        if conflicts == 0:
+            return colors
+        if deadline is not None and perf_counter() > deadline:
+            break
+        own = gamma[rows, colors]
+        conflicting = np.flatnonzero(own > 0)
+        delta = (gamma[conflicting] - own[conflicting, None]).astype(np.float64)
+        delta[np.arange(len(conflicting)), colors[conflicting]] = np.inf
+        # A tabu move is still allowed when it would beat the best count seen
+        delta[(tabu[conflicting] > it) & (conflicts + delta >= best)] = np.inf
+        # Adding noise below 1 to the integer changes breaks ties at random
+        delta += rng.random(delta.shape) * 0.5
+        flat = int(np.argmin(delta))
+        if delta.flat[flat] == np.inf:
+            continue
+        v, new = int(conflicting[flat // k]), flat % k
+        old = colors[v]
+        nbrs = indices[indptr[v]:indptr[v + 1]]
+        conflicts += int(gamma[v, new] - gamma[v, old])
+        gamma[nbrs, old] -= 1
+        gamma[nbrs, new] += 1
+        colors[v] = new
+        tabu[v, old] = it + int(0.6 * len(conflicting)) + int(rng.integers(10))
+        best = min(best, conflicts)
+    return colors if conflicts == 0 else None
+
+# Colors G so that no edge joins two nodes with the same color, using as few colors as it can.
+# Each round of clique removal on the complement removes a clique of the complement, which is an independent set of G,
+# so the rounds already partition G into color classes. Kempe chain moves and Tabucol then try to use fewer colors,
+# Tabucol taking up to iterations steps for each color it tries to remove, within time_limit seconds
+# Returns an array of colors 0, 1, ... in the order of list(G)
+def color_graph(G, iterations=10000, time_limit=None, seed=None):
+    start = perf_counter()
+    deadline = None if time_limit is None else start + time_limit
+    rng = np.random.default_rng(seed)
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    colors = np.zeros(len(nodes), dtype=np.int64)
+    for color, (C, I) in enumerate(clique_removal_rounds(G, complement=True)):
+        colors[[index[v] for v in C]] = color
+    if len(nodes) == 0:
+        return colors
+
+    indptr, indices = graph_csr(G, nodes)
+    neighbors = [indices[indptr[u]:indptr[u + 1]].tolist() for u in range(len(nodes))]
+    colors = kempe_reduce(neighbors, colors)
+    while colors.max() > 0 and (deadline is None or perf_counter() < deadline):
+        fewer = tabucol(indptr, indices, colors, int(colors.max()), iterations, rng, deadline)
+        if fewer is None:
+            break
+        colors = kempe_reduce(neighbors, fewer)
+    return colors
+
+# Compares color_graph with nx.greedy_color on time and colors used, on random graphs of each size and edge probability
+def benchmark_coloring(graphs=((100, 0.5), (500, 0.1), (500, 0.5), (1000, 0.05)), iterations=10000):
+    for n, p in graphs:
+        G = nx.fast_gnp_random_graph(n, p)
+        start = perf_counter()
+        rounds = sum(1 for round in clique_removal_rounds(G, complement=True))
+        print(f"{n} nodes, p = {p}: clique removal rounds alone use {rounds} colors in {perf_counter() - start:.2f}s")
+
+        start = perf_counter()
+        colors = color_graph(G, iterations)
+        seconds = perf_counter() - start
+        assert all(colors[u] != colors[v] for u, v in G.edges)
+        print(f"    color_graph: {colors.max() + 1} colors in {seconds:.2f}s")
+
+        for strategy in ["largest_first", "saturation_largest_first"]:
+            start = perf_counter()
+            coloring = nx.greedy_color(G, strategy)
+            print(f"    nx.greedy_color {strategy}: {max(coloring.values()) + 1} colors in {perf_counter() - start:.2f}s")
+
+# Checks exact_max_clique against the largest clique from nx.find_cliques on random graphs, with and without self-loops
+def test_exact_max_clique(trials=100):
+    passed = 0
+    for t in range(trials):
+        G = nx.fast_gnp_random_graph(t % 40 + 1, [0.1, 0.3, 0.5, 0.7, 0.9][t % 5])
+        if t % 2:
+            G.add_edges_from((v, v) for v in G if random.random() < 0.3)
+        C, upper_bound, stats = exact_max_clique(G)
+        size = max((len(c) for c in nx.find_cliques(G)), default=0)
+        passed += len(C) == size == upper_bound and all(G.has_edge(u, v) for u in C for v in C if u != v)
+    print(f"{passed} / {trials} exact maximum cliques match networkx")
+
+# Compares the peak memory and time of max_clique with the old approach of building nx.complement(G) first.
+# Runs on random graphs with the given average degree, and only builds the complement up to complement_limit nodes
+def benchmark_max_clique_memory(sizes=(500, 2000, 5000, 20000), degree=10, complement_limit=2000):
+    import tracemalloc
+
+    for n in sizes:
+        G = nx.fast_gnp_random_graph(n, degree / n)
+        runs = [("implicit", lambda: max_clique(G))]
+        if n <= complement_limit:
+            runs.append(("nx.complement", lambda: set(clique_removal(nx.complement(G)).nodes)))
+        for name, run in runs:
+            tracemalloc.start()
+            start = perf_counter()
+            C = run()
+            seconds = perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{n} nodes, {name}: clique of {len(C)} in {seconds:.3f}s, peak {peak / 2**20:.1f} MiB")
+
 # Both test1 and test2 have a call to plt.show() at the end, uncomment this to see a visualization
 # of the algorithms output.
 
@@ -86,8 +583,8 @@ def test(G):
     axes[0].set_title("C")
     axes[1].set_title("I")
 
-    nx.draw(G1, pos, ax=axes[0], node_color=["#FF6961" if node in C.nodes else "#87CEEB" for node in G.nodes], with_labels=True)
-    nx.draw(G1, pos, ax=axes[1], node_color=["#FF6961" if node in I.nodes else "#87CEEB" for node in G.nodes], with_labels=True)
+    nx.draw(G1, pos, ax=axes[0], node_color=["#FF6961" if node in C else "#87CEEB" for node in G.nodes], with_labels=True)
+    nx.draw(G1, pos, ax=axes[1], node_color=["#FF6961" if node in I else "#87CEEB" for node in G.nodes], with_labels=True)
     # nx.draw(G1, pos, with_labels=True)
 
     nx.draw_networkx_labels(G1, pos, ax=axes[0])
@@ -112,13 +609,28 @@ def test2(G):
     print(f"Clique found: {len(C)} nodes")
     plt.show()
 
-# Generate random graph, then run test1 and test2
-n = 10
-c = 0.5
-G1 = nx.fast_gnp_random_graph(n, c)
+if __name__ == "__main__":
+    # Generate random graph, then run test1 and test2
+    n = 10
+    c = 0.5
+    G1 = nx.fast_gnp_random_graph(n, c)
+
+    print(f"For graph with {n} nodes and {c} chance of nodes being connected,\n")
+    print("Without clique removal")
+    test(G1)
+    print("\nWith clique removal")
+    test2(G1)
+
+    # Compares the memory of max_clique on the implicit complement with building nx.complement(G)
+    # benchmark_max_clique_memory()
+
+    # Solves maximum clique exactly, or reports the best clique and a proven upper bound after 10 seconds
+    # print(exact_max_clique(nx.fast_gnp_random_graph(300, 0.5), time_limit=10))
+    # test_exact_max_clique()
+
+    # Races restarts of clique removal from different node orders across 4 processes for 10 seconds
+    # benchmark_portfolio(workers=4)
 
-print(f"For graph with {n} nodes and {c} chance of nodes being connected,\n")
-print("Without clique removal")
-test(G1)
-print("\nWith clique removal")
-test2(G1)
\ No newline at end of file
+    # Colors a graph from the clique removal rounds, and compares it with nx.greedy_color
+    # print(color_graph(G1))
+    # benchmark_coloring()